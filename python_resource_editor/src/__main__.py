@@ -1,61 +1,51 @@
 # src/__main__.py
 
-import customtkinter
-from .gui.main_window import App # Import the App class from the gui module
 import os # For path operations
+import shutil # For PATH lookups
+from typing import Iterator, Optional
+
+def _tool_candidates(name: str, project_root: str) -> Iterator[str]:
+    """ Yields possible locations of an external tool, most specific first; later ones are only computed if needed. """
+    # Path if data/ is sibling to src/ under project_root (e.g., python_resource_editor/data/bin/TOOL)
+    yield os.path.join(project_root, "data", "bin", name)
+    # Path if data/ is one level above project_root (e.g., some_dev_root/data/bin/TOOL)
+    yield os.path.join(os.path.dirname(project_root), "data", "bin", name)
+    path_hit = shutil.which(name) # Fallback to PATH
+    if path_hit: yield path_hit
+
+def _find_tool(name: str, project_root: str) -> Optional[str]:
+    """ Returns the first existing candidate from _tool_candidates, or None. """
+    return next((path for path in _tool_candidates(name, project_root) if os.path.isfile(path)), None)
 
 def main():
+    # --- Locate external tools (mcpp, windres) before any GUI work ---
+    project_root_guess = os.path.abspath(os.path.join(os.path.dirname(__file__), "..")) # .../python_resource_editor/
+
+    mcpp_path = _find_tool("mcpp.exe", project_root_guess)
+    windres_path = _find_tool("windres.exe", project_root_guess)
+
+    # GUI imports are deferred until here so tool discovery does not wait on Tk/customtkinter start-up.
+    import customtkinter
+    from .gui.main_window import App # Import the App class from the gui module
+
     # Set appearance mode and color theme for customtkinter
     customtkinter.set_appearance_mode("System")
     customtkinter.set_default_color_theme("blue")
 
     app = App()
 
-    # --- Configure paths for external tools (mcpp, windres) ---
-    script_dir = os.path.dirname(__file__) # .../src/
-    project_root_guess = os.path.abspath(os.path.join(script_dir, "..")) # .../python_resource_editor/
-
-    # Path if data/ is sibling to src/ under project_root (e.g., python_resource_editor/data/bin/TOOL)
-    common_path_style1 = os.path.join(project_root_guess, "data", "bin")
-    # Path if data/ is one level above project_root (e.g., some_dev_root/data/bin/TOOL)
-    common_path_style2 = os.path.abspath(os.path.join(project_root_guess, "..", "data", "bin"))
-
     # Configure mcpp_path
-    mcpp_exe_name = "mcpp.exe"
-    mcpp_path_options = [
-        os.path.join(common_path_style1, mcpp_exe_name),
-        os.path.join(common_path_style2, mcpp_exe_name),
-        mcpp_exe_name # Fallback to PATH
-    ]
-
-    found_mcpp = False
-    for path_option in mcpp_path_options:
-        if os.path.exists(path_option) or \
-           (not os.path.dirname(path_option) and any(os.access(os.path.join(p, path_option), os.X_OK) for p in os.environ["PATH"].split(os.pathsep))):
-            app.mcpp_path = path_option
-            print(f"INFO: Using mcpp from: {os.path.abspath(app.mcpp_path) if os.path.dirname(app.mcpp_path) else app.mcpp_path}")
-            found_mcpp = True
-            break
-    if not found_mcpp:
+    if mcpp_path:
+        app.mcpp_path = mcpp_path
+        print(f"INFO: Using mcpp from: {mcpp_path}")
+    else:
         print(f"WARNING: mcpp.exe not found in common relative project paths or system PATH. RC file parsing might fail.")
 
     # Configure windres_path
-    windres_exe_name = "windres.exe"
-    windres_path_options = [
-        os.path.join(common_path_style1, windres_exe_name),
-        os.path.join(common_path_style2, windres_exe_name),
-        windres_exe_name # Fallback to PATH
-    ]
-
-    found_windres = False
-    for path_option in windres_path_options:
-        if os.path.exists(path_option) or \
-           (not os.path.dirname(path_option) and any(os.access(os.path.join(p, path_option), os.X_OK) for p in os.environ["PATH"].split(os.pathsep))):
-            app.windres_path = path_option
-            print(f"INFO: Using windres from: {os.path.abspath(app.windres_path) if os.path.dirname(app.windres_path) else app.windres_path}")
-            found_windres = True
-            break
-    if not found_windres:
+    if windres_path:
+        app.windres_path = windres_path
+        print(f"INFO: Using windres from: {windres_path}")
+    else:
          print(f"WARNING: windres.exe not found in common relative project paths or system PATH. Compiling to .res might fail.")
 
     # Start the customtkinter event loop
@@ -63,4 +53,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
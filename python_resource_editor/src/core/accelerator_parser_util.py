@@ -1,5 +1,8 @@
 import re
-from typing import List, Optional, Tuple, Union
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Union
 
 # Accelerator flags (from fVirt field of ACCELTABLEENTRY)
 FVIRTKEY = 0x01
@@ -10,32 +13,75 @@ FALT = 0x10
 ACCEL_LAST_ENTRY_FVIRT = 0x80 # Bit in fVirt indicating the last entry in the table (older format)
                                # Modern tables might just end, or have all-zero entry.
 
-ACCEL_FLAG_MAP_TO_STR = {
+ACCEL_FLAG_MAP_TO_STR = MappingProxyType({
     # FVIRTKEY is handled by "VIRTKEY" or "ASCII" text, not directly here for string list
     FSHIFT: "SHIFT",
     FCONTROL: "CONTROL",
     FALT: "ALT",
     FNOINVERT: "NOINVERT", # Rarely used as text in RC, but can be a flag
-}
+}) # Read-only view: shared lookup table, never mutated
+
+# Canonical (interned) spellings of the RC flag keywords, so entries built from
+# parsed text share the same string objects.
+_CANON_FLAGS = MappingProxyType({f: sys.intern(f) for f in ("VIRTKEY", "ASCII", "SHIFT", "CONTROL", "ALT", "NOINVERT")})
+
+def _canon_flag(flag: str) -> str:
+    flag = flag.upper().strip()
+    return _CANON_FLAGS.get(flag) or sys.intern(flag)
 
 # Basic VK map for common keys. Can be expanded.
 # Windows VK codes: https://docs.microsoft.com/en-us/windows/win32/inputdev/virtual-key-codes
-VK_CODE_TO_STR_MAP = {
-    0x08: "VK_BACK", 0x09: "VK_TAB", 0x0D: "VK_RETURN", 0x1B: "VK_ESCAPE",
-    0x20: "VK_SPACE", 0x25: "VK_LEFT", 0x26: "VK_UP", 0x27: "VK_RIGHT", 0x28: "VK_DOWN",
-    0x2C: "VK_SNAPSHOT", # Print Screen
-    0x2D: "VK_INSERT", 0x2E: "VK_DELETE", 0x2F: "VK_HELP",
-    # Digits 0-9 (same as ASCII '0'-'9')
-    **{0x30 + i: str(i) for i in range(10)},
-    # Characters A-Z (same as ASCII 'A'-'Z')
-    **{0x41 + i: chr(ord('A') + i) for i in range(26)},
-    # Function keys VK_F1 to VK_F24 (0x70 to 0x87)
-    **{0x70 + i: f"VK_F{i+1}" for i in range(24)},
-    0x90: "VK_NUMLOCK", 0x91: "VK_SCROLL",
-    # More can be added: VK_LSHIFT, VK_RSHIFT, VK_LCONTROL, VK_RCONTROL, VK_LMENU, VK_RMENU
-    # VK_OEM_1 (:;), VK_OEM_PLUS (+), VK_OEM_COMMA (,), VK_OEM_MINUS (-), VK_OEM_PERIOD (.)
-    # VK_OEM_2 (/?), VK_OEM_3 (`~), VK_OEM_4 ([{), VK_OEM_5 (\|), VK_OEM_6 (]}), VK_OEM_7 ('")
-}
+# Built on first use (see _get_vk_map) so importing the module stays cheap; the
+# public VK_CODE_TO_STR_MAP name is still served through the module __getattr__ below.
+_VK_CODE_TO_STR_MAP: Optional[Dict[int, str]] = None
+
+def _get_vk_map() -> Dict[int, str]:
+    global _VK_CODE_TO_STR_MAP
+    if _VK_CODE_TO_STR_MAP is None:
+        _VK_CODE_TO_STR_MAP = {
+            0x08: "VK_BACK", 0x09: "VK_TAB", 0x0D: "VK_RETURN", 0x1B: "VK_ESCAPE",
+            0x20: "VK_SPACE", 0x25: "VK_LEFT", 0x26: "VK_UP", 0x27: "VK_RIGHT", 0x28: "VK_DOWN",
+            0x2C: "VK_SNAPSHOT", # Print Screen
+            0x2D: "VK_INSERT", 0x2E: "VK_DELETE", 0x2F: "VK_HELP",
+            # Digits 0-9 (same as ASCII '0'-'9')
+            **{0x30 + i: str(i) for i in range(10)},
+            # Characters A-Z (same as ASCII 'A'-'Z')
+            **{0x41 + i: chr(ord('A') + i) for i in range(26)},
+            # Function keys VK_F1 to VK_F24 (0x70 to 0x87)
+            **{0x70 + i: f"VK_F{i+1}" for i in range(24)},
+            0x90: "VK_NUMLOCK", 0x91: "VK_SCROLL",
+            # More can be added: VK_LSHIFT, VK_RSHIFT, VK_LCONTROL, VK_RCONTROL, VK_LMENU, VK_RMENU
+            # VK_OEM_1 (:;), VK_OEM_PLUS (+), VK_OEM_COMMA (,), VK_OEM_MINUS (-), VK_OEM_PERIOD (.)
+            # VK_OEM_2 (/?), VK_OEM_3 (`~), VK_OEM_4 ([{), VK_OEM_5 (\|), VK_OEM_6 (]}), VK_OEM_7 ('")
+        }
+    return _VK_CODE_TO_STR_MAP
+
+def __getattr__(name: str):
+    if name == "VK_CODE_TO_STR_MAP":
+        return _get_vk_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Compiled once at import; parse_accelerator_rc_text may run for every accelerator table in a script.
+_ENTRY_RE = re.compile(
+    r'^\s*(\^?"[^A-Za-z0-9\s]"|\^?[A-Za-z0-9_#\.\-\+\^"]+|\S+)\s*,\s*'  # Key: Quoted char, VK_*, ^char, or other symbols
+    r'([A-Za-z0-9_#\.]+)\s*'  # Command ID
+    r'(?:,\s*(.*))?$',  # Optional flags string
+    re.IGNORECASE
+)
+_HEADER_RE = re.compile(r'^\s*([A-Za-z0-9_#\."\+\-\^]+)\s+ACCELERATORS\b', re.IGNORECASE)
+# RC numeric IDs: decimal, or hex with a 0x/0X prefix (rc accepts both cases). Python-only int() forms
+# such as 1_0, 0o7 or 0b1 are left as symbolic names, as rc would treat them.
+_RC_NUMBER_RE = re.compile(r'0[xX]([0-9A-Fa-f]+)|([0-9]+)')
+# Yields each non-blank line already stripped (group 1), scanning rc_text in place instead of splitting it into a list.
+_STRIPPED_LINE_RE = re.compile(r'^\s*(\S.*?)\s*$', re.MULTILINE)
+
+@lru_cache(maxsize=1024) # Pure function of two small ints; accelerator lists redraw the same keys often
+def _rc_int(value: str) -> int:
+    """Parses a decimal or 0x/0X hex RC numeric ID. Raises ValueError for anything else."""
+    match = _RC_NUMBER_RE.fullmatch(value)
+    if match is None: raise ValueError(f"Not an RC number: {value!r}")
+    hex_digits, dec_digits = match.groups()
+    return int(hex_digits, 16) if hex_digits is not None else int(dec_digits)
 
 def format_accel_key_event_str(key_code: int, fVirt_flags: int) -> str:
     """ Formats the key event information into a string representation for display or RC. """
@@ -59,7 +105,7 @@ def format_accel_key_event_str(key_code: int, fVirt_flags: int) -> str:
     # ALT and SHIFT are usually listed as flags, not part of key_event_str for VIRTKEYs
     # unless it's a specific notation like % for ALT (less common for accelerators).
 
-    vk_str = VK_CODE_TO_STR_MAP.get(key_code)
+    vk_str = _get_vk_map().get(key_code)
     if vk_str:
         # If it's a simple char like 'A' that also has a VK_ code, and Control is pressed,
         # the RC text might be "^A". Otherwise, it's "VK_A".
@@ -72,6 +118,8 @@ def format_accel_key_event_str(key_code: int, fVirt_flags: int) -> str:
     return str(key_code) # Fallback to numeric virtual key code if not in map
 
 class AcceleratorEntry:
+    __slots__ = ("key_event_str", "command_id", "command_id_str", "type_flags_str")
+
     def __init__(self, key_event_str: str, command_id: Union[int, str],
                  command_id_str: Optional[str] = None,
                  type_flags_str: Optional[List[str]] = None):
@@ -79,11 +127,7 @@ class AcceleratorEntry:
         self.command_id: Union[int, str] = command_id
         self.command_id_str: Optional[str] = command_id_str
 
-        self.type_flags_str: List[str] = []
-        if type_flags_str:
-            for flag in type_flags_str:
-                if isinstance(flag, str):
-                    self.type_flags_str.append(flag.upper().strip())
+        self.type_flags_str: List[str] = [_canon_flag(flag) for flag in type_flags_str if isinstance(flag, str)] if type_flags_str else []
 
     def get_command_id_display(self) -> str:
         return self.command_id_str if self.command_id_str else str(self.command_id)
@@ -93,98 +137,108 @@ class AcceleratorEntry:
                 f"flags={self.type_flags_str})")
 
 
-def parse_accelerator_rc_text(rc_text: str) -> Tuple[Optional[Union[str, int]], List[AcceleratorEntry]]:
-    entries: List[AcceleratorEntry] = []
+def _normalize_flags(key_event_str: str, flags_rc_str: Optional[str]) -> List[str]:
+    """ Splits an RC flags string into canonical flag names, adding the implied VIRTKEY/ASCII type if neither is given. """
+    type_flags = [_CANON_FLAGS.get(f) or sys.intern(f)
+                  for f in (part.strip() for part in flags_rc_str.upper().split(',')) if f] if flags_rc_str else []
+    flag_set = frozenset(type_flags)
+    if "ASCII" not in flag_set and "VIRTKEY" not in flag_set:
+        # Infer VIRTKEY if key is ^X or VK_ style; ASCII is the default for simple char keys
+        type_flags.append("VIRTKEY" if key_event_str[:1] == "^" or key_event_str[:3] == "VK_" else "ASCII")
+    return type_flags
+
+
+# Immutable parse result for one table entry: (key_event_str, command_id, command_id_str, type_flags)
+_AcceleratorRow = Tuple[str, Union[int, str], Optional[str], Tuple[str, ...]]
+
+@lru_cache(maxsize=64)
+def _parse_accelerator_rc_rows(rc_text: str) -> Tuple[Optional[Union[str, int]], Tuple[_AcceleratorRow, ...]]:
+    """
+    Parses an ACCELERATORS block into immutable rows.
+    Cached on the RC text itself, since the editor re-parses the same unchanged block repeatedly.
+    Only hashable, immutable data is cached; parse_accelerator_rc_text builds fresh entries from it.
+    """
+    rows: List[_AcceleratorRow] = []
     table_name_or_id: Optional[Union[str, int]] = None
 
-    entry_pattern = re.compile(
-        r'^\s*(\^?"[^A-Za-z0-9\s]"|\^?[A-Za-z0-9_#\.\-\+\^"]+|\S+)\s*,\s*'  # Key: Quoted char, VK_*, ^char, or other symbols
-        r'([A-Za-z0-9_#\.]+)\s*'  # Command ID
-        r'(?:,\s*(.*))?$',  # Optional flags string
-        re.IGNORECASE
-    )
+    # Bound once so the loop body uses fast local lookups
+    rows_append = rows.append
+    match_entry = _ENTRY_RE.match
+    normalize_flags = _normalize_flags
 
     in_block = False
-    for line in rc_text.splitlines():
-        line_strip = line.strip()
-        if not line_strip or line_strip.startswith("//") or line_strip.startswith("/*"):
+    for line_match in _STRIPPED_LINE_RE.finditer(rc_text):
+        line_strip = line_match.group(1)
+        if line_strip[0] == "/" and line_strip[1:2] in ("/", "*"): # // or /* comment
             continue
 
-        if line_strip.upper().startswith("ACCELERATORS "):
-            header_match = re.match(r'^\s*([A-Za-z0-9_#\."\+\-\^]+)\s+ACCELERATORS\b', line_strip, re.IGNORECASE)
+        line_upper = line_strip.upper()
+        if line_upper.startswith("ACCELERATORS "):
+            header_match = _HEADER_RE.match(line_strip)
             if header_match:
-                name_str = header_match.group(1).strip('"')
-                if name_str.isdigit() or name_str.startswith("0x"): table_name_or_id = int(name_str,0)
-                else: table_name_or_id = name_str
+                name_str = header_match.group(1)
+                if len(name_str) > 1 and name_str[0] == '"' == name_str[-1]: name_str = name_str[1:-1]
+                try: table_name_or_id = _rc_int(name_str)
+                except ValueError: table_name_or_id = name_str
             continue
 
-        if line_strip.upper() == "BEGIN": in_block = True; continue
-        if line_strip.upper() == "END": in_block = False; break
+        if line_upper == "BEGIN": in_block = True; continue
+        if line_upper == "END": in_block = False; break
 
         if in_block:
-            match = entry_pattern.match(line_strip)
+            match = match_entry(line_strip)
             if match:
-                key_event_str = match.group(1).strip()
-                command_id_str_from_rc = match.group(2).strip()
-                flags_rc_str = match.group(3)
+                key_event_str, command_id_str_from_rc, flags_rc_str = match.groups()
+                key_event_str = key_event_str.strip()
+                command_id_str_from_rc = command_id_str_from_rc.strip()
 
                 cmd_id: Union[int, str]; cmd_id_symbolic: Optional[str] = None
-                if command_id_str_from_rc.isdigit() or (command_id_str_from_rc.startswith("0x")):
-                    try: cmd_id = int(command_id_str_from_rc, 0)
-                    except ValueError: cmd_id = command_id_str_from_rc; cmd_id_symbolic = command_id_str_from_rc
-                else: cmd_id = command_id_str_from_rc; cmd_id_symbolic = command_id_str_from_rc
-
-                type_flags: List[str] = []
-                if flags_rc_str:
-                    type_flags = [f.strip().upper() for f in flags_rc_str.split(',') if f.strip()]
+                try: cmd_id = _rc_int(command_id_str_from_rc)
+                except ValueError: cmd_id = command_id_str_from_rc; cmd_id_symbolic = command_id_str_from_rc
 
                 # Ensure key_event_str is not double-quoted if it was already quoted
-                if key_event_str.startswith('"') and key_event_str.endswith('"') and len(key_event_str) > 1:
+                if len(key_event_str) > 1 and key_event_str[0] == '"' == key_event_str[-1]:
                     key_event_str = key_event_str[1:-1]
 
-                # Infer VIRTKEY if key is ^X or VK_ style and no ASCII flag
-                is_virtkey_style_key = key_event_str.startswith("VK_") or key_event_str.startswith("^")
-                if is_virtkey_style_key and "ASCII" not in type_flags and "VIRTKEY" not in type_flags:
-                    type_flags.append("VIRTKEY")
-                elif not is_virtkey_style_key and "VIRTKEY" not in type_flags and "ASCII" not in type_flags:
-                    type_flags.append("ASCII") # Default for simple char keys
+                rows_append((key_event_str, cmd_id, cmd_id_symbolic, tuple(normalize_flags(key_event_str, flags_rc_str))))
+    return table_name_or_id, tuple(rows)
+
+
+def parse_accelerator_rc_text(rc_text: str) -> Tuple[Optional[Union[str, int]], List[AcceleratorEntry]]:
+    table_name_or_id, rows = _parse_accelerator_rc_rows(rc_text)
+    # New entry objects on every call: callers (and the editor) may mutate them freely.
+    return table_name_or_id, [AcceleratorEntry(key_event_str, cmd_id, cmd_id_symbolic, list(type_flags))
+                              for key_event_str, cmd_id, cmd_id_symbolic, type_flags in rows]
+
+
+def _format_accelerator_rc_line(entry: AcceleratorEntry) -> str:
+    """ Formats one ACCELERATORS table line, e.g. '    "A", 101, ALT'. """
+    key_event_str = entry.key_event_str
+    is_caret_key = key_event_str.startswith("^")
+    key_part = f'"{key_event_str}"' if len(key_event_str) == 1 or is_caret_key else key_event_str # Quote single chars and ^X style
+
+    # Filter out VIRTKEY/ASCII from flags list for RC text if it's implied by key_part
+    # or if it's the default (ASCII for single char, VIRTKEY for VK_ or ^)
+    flags = entry.type_flags_str
+    flag_set = frozenset(flags)
+    is_vk_style = is_caret_key or key_event_str.startswith("VK_")
+    implied_flag = ("VIRTKEY" if "ASCII" not in flag_set else None) if is_vk_style else \
+                   ("ASCII" if "VIRTKEY" not in flag_set else None)
+    flags_part = ", ".join([flag for flag in flags if flag != implied_flag])
 
-                entries.append(AcceleratorEntry(key_event_str, cmd_id, cmd_id_symbolic, type_flags))
-    return table_name_or_id, entries
+    line = f"    {key_part}, {entry.get_command_id_display()}"
+    return f"{line}, {flags_part}" if flags_part else line
 
 
 def generate_accelerator_rc_text(table_name_or_id: Union[str, int],
                                  entries: List[AcceleratorEntry],
                                  lang_id: Optional[int] = None) -> str:
-    lines: List[str] = []
-    if lang_id is not None: lines.append(f"LANGUAGE {lang_id & 0x3FF}, {(lang_id >> 10) & 0x3F}")
+    header_lines: List[str] = []
+    if lang_id is not None: header_lines.append(f"LANGUAGE {lang_id & 0x3FF}, {(lang_id >> 10) & 0x3F}")
     name_str = f'"{table_name_or_id}"' if isinstance(table_name_or_id, str) and not table_name_or_id.isdigit() else str(table_name_or_id)
-    lines.append(f"{name_str} ACCELERATORS")
-    lines.append("BEGIN")
-    for entry in entries:
-        key_part = entry.key_event_str
-        if len(entry.key_event_str) == 1 or entry.key_event_str.startswith("^"): # Quote single chars and ^X style
-            key_part = f'"{entry.key_event_str}"'
-
-        cmd_part = entry.get_command_id_display()
-        # Filter out VIRTKEY/ASCII from flags list for RC text if it's implied by key_part
-        # or if it's the default (ASCII for single char, VIRTKEY for VK_ or ^)
-        flags_to_write = []
-        is_vk_style = entry.key_event_str.startswith("VK_") or entry.key_event_str.startswith("^")
-        explicit_ascii = "ASCII" in entry.type_flags_str
-        explicit_virtkey = "VIRTKEY" in entry.type_flags_str
-
-        for flag in entry.type_flags_str:
-            if flag == "VIRTKEY" and is_vk_style and not explicit_ascii: continue # Implied
-            if flag == "ASCII" and not is_vk_style and not explicit_virtkey: continue # Implied
-            flags_to_write.append(flag)
-
-        flags_part = ", ".join(flags_to_write) if flags_to_write else ""
-        line = f"    {key_part}, {cmd_part}"
-        if flags_part: line += f", {flags_part}"
-        lines.append(line)
-    lines.append("END")
-    return "\n".join(lines)
+    header_lines.append(f"{name_str} ACCELERATORS")
+    body = [_format_accelerator_rc_line(entry) for entry in entries]
+    return "\n".join([*header_lines, "BEGIN", *body, "END"])
 
 
 if __name__ == '__main__':
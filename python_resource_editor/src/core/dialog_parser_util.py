@@ -1,7 +1,10 @@
 import re
-from typing import List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple, Union
 import io
 import struct
+import sys
+from types import MappingProxyType
 
 # --- Dialog Styles (WS_, DS_, etc. from WinUser.h) ---
 # Window Styles (WS_) - Common subset
@@ -74,11 +77,13 @@ WC_MONTHCAL = "SysMonthCal32"
 WC_IPADDRESS = "SysIPAddress32"
 WC_LINK = "SysLink"
 
-ATOM_TO_CLASSNAME_MAP = {
+# Read-only views: these are shared lookup tables, not per-dialog state. The names are
+# identifier-like literals, so CPython has already interned them.
+ATOM_TO_CLASSNAME_MAP = MappingProxyType({
     BUTTON_ATOM: "BUTTON", EDIT_ATOM: "EDIT", STATIC_ATOM: "STATIC",
     LISTBOX_ATOM: "LISTBOX", SCROLLBAR_ATOM: "SCROLLBAR", COMBOBOX_ATOM: "COMBOBOX",
-}
-CLASSNAME_TO_ATOM_MAP = {v: k for k, v in ATOM_TO_CLASSNAME_MAP.items()}
+})
+CLASSNAME_TO_ATOM_MAP = MappingProxyType({v: k for k, v in ATOM_TO_CLASSNAME_MAP.items()})
 # Add string class names to ATOM_TO_CLASSNAME_MAP for reverse lookup convenience if needed,
 # though they are not atoms. Or keep a separate list of known string class names.
 KNOWN_STRING_CLASSES = [
@@ -168,83 +173,115 @@ SBS_VERT = 0x0001 # Vertical scroll bar
 
 # --- Style to String Maps (for display) ---
 # This needs to be a dictionary where keys are prefixes/class_names and values are dicts of val->str
-STYLE_TO_STR_MAP_BY_CLASS = {
-    "GENERAL_WS": {v: k for k, v in globals().items() if k.startswith("WS_") and k != "WS_CHILD"}, # WS_CHILD is almost universal for controls
-    "GENERAL_DS": {v: k for k, v in globals().items() if k.startswith("DS_")},
-    "BUTTON": {v: k for k, v in globals().items() if k.startswith("BS_")},
-    "EDIT": {v: k for k, v in globals().items() if k.startswith("ES_")},
-    "STATIC": {v: k for k, v in globals().items() if k.startswith("SS_")},
-    "LISTBOX": {v: k for k, v in globals().items() if k.startswith("LBS_")},
-    "COMBOBOX": {v: k for k, v in globals().items() if k.startswith("CBS_")},
-    WC_LISTVIEW: {v: k for k, v in globals().items() if k.startswith("LVS_")},
-    WC_TREEVIEW: {v: k for k, v in globals().items() if k.startswith("TVS_")},
-    WC_TABCONTROL: {v: k for k, v in globals().items() if k.startswith("TCS_")},
-    WC_PROGRESS: {v: k for k, v in globals().items() if k.startswith("PBS_")},
-    WC_TRACKBAR: {v: k for k, v in globals().items() if k.startswith("TBS_")},
-    WC_UPDOWN: {v: k for k, v in globals().items() if k.startswith("UDS_")},
-    WC_DATETIMEPICK: {v: k for k, v in globals().items() if k.startswith("DTS_")},
-    WC_MONTHCAL: {v: k for k, v in globals().items() if k.startswith("MCS_")},
-    "SCROLLBAR": {v: k for k, v in globals().items() if k.startswith("SBS_")}, # Added SCROLLBAR
+# Style constant name prefix -> STYLE_TO_STR_MAP_BY_CLASS key (WS_EX_ names go to EXSTYLE_TO_STR_MAP)
+_STYLE_PREFIX_TO_CLASS = {
+    "WS_": "GENERAL_WS", "DS_": "GENERAL_DS", "BS_": "BUTTON", "ES_": "EDIT", "SS_": "STATIC",
+    "LBS_": "LISTBOX", "CBS_": "COMBOBOX", "LVS_": WC_LISTVIEW, "TVS_": WC_TREEVIEW,
+    "TCS_": WC_TABCONTROL, "PBS_": WC_PROGRESS, "TBS_": WC_TRACKBAR, "UDS_": WC_UPDOWN,
+    "DTS_": WC_DATETIMEPICK, "MCS_": WC_MONTHCAL, "SBS_": "SCROLLBAR",
 }
-EXSTYLE_TO_STR_MAP = {v: k for k, v in globals().items() if k.startswith("WS_EX_")}
-
-def _format_style_flags(style_value: int, style_map_list: List[dict[int, str]]) -> str:
+STYLE_TO_STR_MAP_BY_CLASS = {class_key: {} for class_key in _STYLE_PREFIX_TO_CLASS.values()}
+EXSTYLE_TO_STR_MAP = {}
+_STYLE_MAP_BY_PREFIX = {prefix: STYLE_TO_STR_MAP_BY_CLASS[class_key] for prefix, class_key in _STYLE_PREFIX_TO_CLASS.items()}
+_STYLE_MAP_BY_PREFIX["WS_EX_"] = EXSTYLE_TO_STR_MAP
+# One pass over the module constants, bucketed by their longest known prefix (value -> name).
+# Aliases such as WS_MINIMIZEBOX (== WS_GROUP) or LVS_ALIGNTOP (== LVS_ICON) keep the first-declared name.
+for _name, _value in list(globals().items()):
+    _head_end = _name.find("_") + 1
+    _style_map = _STYLE_MAP_BY_PREFIX.get(_name[:_name.find("_", _head_end) + 1]) if _head_end else None
+    if _style_map is None: _style_map = _STYLE_MAP_BY_PREFIX.get(_name[:_head_end])
+    if _style_map is not None: _style_map.setdefault(_value, _name)
+del _name, _value, _head_end, _style_map
+
+# Symbolic style names accepted in RC STYLE/EXSTYLE expressions (name -> value)
+_STYLE_NAME_PREFIXES = ("WS_", "DS_", "BS_", "ES_", "SS_", "LBS_", "CBS_", "LVS_", "TVS_",
+                        "TCS_", "PBS_", "TBS_", "UDS_", "DTS_", "MCS_", "SBS_")
+_STYLE_CONSTANTS = {k: v for k, v in globals().items() if k.startswith(_STYLE_NAME_PREFIXES) and isinstance(v, int)}
+
+# The module's own maps by name, so formatted styles can be cached per (value, map names).
+# Those maps are built once above and never mutated.
+_STYLE_MAPS_BY_KEY = {**STYLE_TO_STR_MAP_BY_CLASS, "EXSTYLE": EXSTYLE_TO_STR_MAP}
+
+# Low-order style bits that hold an enumerated control type rather than independent flags
+# (BS_TYPEMASK, SS_TYPEMASK, the ES_ alignment, CBS_ and LVS_ type fields)
+_STYLE_ENUM_MASK_BY_CLASS = {"BUTTON": 0x0F, "STATIC": 0x1F, "EDIT": 0x03, "COMBOBOX": 0x03, WC_LISTVIEW: 0x03}
+_STYLE_ENUM_MASKS_BY_MAP_ID = {id(STYLE_TO_STR_MAP_BY_CLASS[class_key]): mask for class_key, mask in _STYLE_ENUM_MASK_BY_CLASS.items()}
+
+def _make_style_formatter(style_map_list) -> Callable[[int], str]:
     """
-    Converts a numeric style value to a string of |-separated flags.
-    Uses a list of provided style maps.
+    Builds a formatter specialised for one combination of style maps: the merged tables are
+    computed here once and bound into the returned closure, and steps the maps cannot need
+    (the 0-value name, the control type field) are left out of it altogether.
+    Values that fall entirely inside a class's type field are only looked up in that class's enum.
     """
-    if style_value == 0 and any(0 in style_map for style_map in style_map_list if style_map.get(0)): # Handle cases like ES_LEFT = 0
-        for style_map in style_map_list:
-            if 0 in style_map: return style_map[0] # Return the first 0-value flag found (e.g. "ES_LEFT")
-        return "0"
-
-    found_flags = []
-    remaining_style = style_value
-
-    # Prioritize exact matches for combined flags (like LBS_STANDARD)
-    for style_map in style_map_list:
-        for flag_val, flag_name in style_map.items():
-            if flag_val == style_value and style_value != 0: # Exact match for the whole style
-                return flag_name
-
-    # Decompose into individual flags
-    # Sort maps by flag value descending to match larger combined flags first (though exact match above handles some of this)
-    # This isn't perfect for complex overlapping combined flags, but good for typical usage.
-    sorted_maps_items = []
-    for style_map in style_map_list:
-        sorted_maps_items.extend(sorted(style_map.items(), key=lambda item: item[0], reverse=True))
-    # Remove duplicates while preserving order (important for consistent output)
-    # sorted_maps_items = sorted(list(set(sorted_maps_items)), key=lambda x: x[0], reverse=True) # This was over-sorting
-
-    # A simpler approach for decomposition:
+    zero_name = next((style_map[0] for style_map in style_map_list if style_map.get(0)), None) # e.g. "ES_LEFT"
+    enum_map = next((style_map for style_map in style_map_list if id(style_map) in _STYLE_ENUM_MASKS_BY_MAP_ID), {})
+    enum_mask = _STYLE_ENUM_MASKS_BY_MAP_ID.get(id(enum_map), 0)
+    enum_names = {val: name for val, name in enum_map.items() if val and not val & ~enum_mask}
     unique_flags = {} # val: name
     for style_map in style_map_list:
         for val, name in style_map.items():
-            if val != 0: # Don't include zero-value flags in decomposition unless it's the only flag
+            if val & ~enum_mask: # Zero-value flags only name a whole zero style; type values go through enum_names
                  if val not in unique_flags : unique_flags[val] = name
-
-    for flag_val, flag_name in sorted(unique_flags.items(), key=lambda x: x[0], reverse=True):
-        if (remaining_style & flag_val) == flag_val:
-            found_flags.append(flag_name)
-            remaining_style &= ~flag_val # Remove these bits
-
-    if remaining_style != 0: # Some bits were not recognized
-        found_flags.append(f"0x{remaining_style:X}")
-
-    if not found_flags:
-        # If original style_value was non-zero but no flags found (e.g. maps are incomplete)
-        if style_value != 0: return f"0x{style_value:X}"
-        # If style_value was 0 and no specific 0-value flag name was found (e.g. WS_OVERLAPPED which is 0)
-        # For RC text, "0" is usually omitted for style if it means default, but explicit 0 might be needed
-        # if the map has a specific name for 0 (like ES_LEFT), it's handled at the start.
-        # Otherwise, we might return "0" or an empty string. For styles, "0" is safer if no flags.
-        return "0"
-
-    return " | ".join(found_flags) if found_flags else "0"
+    # Composite flags (LBS_STANDARD, WS_CAPTION) must be tried before the single bits they contain.
+    # No flag with more bits can be a subset of a named value, so an exact match is always found first.
+    sorted_flags = sorted(unique_flags.items(), key=lambda x: (-bin(x[0]).count("1"), -x[0]))
+    multi_bit_flags = tuple((val, name) for val, name in sorted_flags if val & (val - 1))
+    single_bit_flags = {val: name for val, name in sorted_flags if not val & (val - 1)}
+    zero_str = zero_name or "0" # If the map has a specific name for 0 (like ES_LEFT) it is used; "0" is safer than ""
+
+    def decompose(found_flags: List[str], remaining_style: int) -> str:
+        # Composites first; this isn't perfect for complex overlapping combined flags, but good for typical usage.
+        for flag_val, flag_name in multi_bit_flags:
+            if remaining_style == 0: break
+            if (remaining_style & flag_val) == flag_val:
+                found_flags.append(flag_name)
+                remaining_style ^= flag_val # Remove these bits
+        # Then only the bits actually set, highest first, each one dict lookup
+        unknown_bits = 0
+        while remaining_style:
+            bit = 1 << (remaining_style.bit_length() - 1)
+            remaining_style ^= bit
+            flag_name = single_bit_flags.get(bit)
+            if flag_name is None: unknown_bits |= bit
+            else: found_flags.append(flag_name)
+        if unknown_bits != 0: # Some bits were not recognized
+            found_flags.append(f"0x{unknown_bits:X}")
+        return " | ".join(found_flags)
+
+    if not enum_mask:
+        def format_style(style_value: int) -> str:
+            if style_value == 0: return zero_str
+            return decompose([], style_value)
+    else:
+        enum_flag = enum_names.get
+        def format_style(style_value: int) -> str:
+            if style_value == 0: return zero_str
+            # The control type (BS_AUTOCHECKBOX, SS_ICON, ...) is one table lookup, not a run of mask tests
+            enum_name = enum_flag(style_value & enum_mask)
+            if enum_name is None: return decompose([], style_value)
+            return decompose([enum_name], style_value & ~enum_mask)
+    return format_style
+
+@lru_cache(maxsize=None)
+def _style_formatter_for_keys(map_keys: Tuple[str, ...]) -> Callable[[int], str]:
+    return _make_style_formatter([_STYLE_MAPS_BY_KEY[map_key] for map_key in map_keys])
+
+@lru_cache(maxsize=4096)
+def _format_style_flags_cached(style_value: int, map_keys: Tuple[str, ...]) -> str:
+    """
+    Converts a numeric style value to a string of |-separated flags, using the module's own maps
+    named by their _STYLE_MAPS_BY_KEY keys (STYLE_TO_STR_MAP_BY_CLASS keys, or "EXSTYLE").
+    Dialogs reuse a small set of styles, so most calls are cache hits.
+    """
+    return _style_formatter_for_keys(map_keys)(style_value)
 
 
 # --- Data Structures ---
 class DialogControlEntry:
+    __slots__ = ("class_name", "text", "id_val", "symbolic_id_name", "x", "y", "width", "height",
+                 "style", "ex_style", "help_id", "creation_data")
+
     def __init__(self, class_name: Union[str, int], text: str, id_val: Union[int, str],
                  x: int, y: int, width: int, height: int,
                  style: int = 0, ex_style: int = 0, help_id: int = 0,
@@ -262,12 +299,16 @@ class DialogControlEntry:
         return str(self.symbolic_id_name or self.id_val or "0")
 
     def __repr__(self):
-        creation_data_summary = f", creation_data_len={len(self.creation_data)}" if self.creation_data else ""
-        return (f"DialogControlEntry(class='{self.class_name}', text='{self.text[:20]}...', "
-                f"id='{self.get_id_display()}', pos=({self.x},{self.y}), size=({self.width},{self.height}), "
-                f"style=0x{self.style:X}{creation_data_summary})")
+        creation_data_summary = ", creation_data_len=%d" % len(self.creation_data) if self.creation_data else ""
+        return ("DialogControlEntry(class='%s', text='%s...', id='%s', pos=(%s,%s), size=(%s,%s), style=0x%X%s)"
+                % (self.class_name, self.text[:20], self.get_id_display(), self.x, self.y,
+                   self.width, self.height, self.style, creation_data_summary))
 
 class DialogProperties:
+    __slots__ = ("name", "symbolic_name", "caption", "x", "y", "width", "height", "style", "ex_style",
+                 "font_name", "font_size", "font_weight", "font_italic", "font_charset",
+                 "menu_name", "symbolic_menu_name", "class_name", "symbolic_class_name", "is_ex", "help_id")
+
     def __init__(self, name: Union[int, str], caption: str = "",
                  x: int = 0, y: int = 0, width: int = 100, height: int = 100,
                  style: int = 0, ex_style: int = 0,
@@ -303,332 +344,603 @@ class DialogProperties:
                 f"size=({self.width}x{self.height}), style=0x{self.style:X}, is_ex={self.is_ex})")
 
 # --- Binary Parsing Helper Functions ---
-def _read_unicode_string_align(stream: io.BytesIO) -> Optional[str]:
+_U16 = struct.Struct('<H')
+_2U16 = struct.Struct('<HH')
+# Fixed-size parts of the dialog templates, compiled once for every dialog and control parsed
+DLGTEMPLATE_HDR = struct.Struct('<LLHHHHH') # style, ex_style, cdit, x, y, cx, cy
+DLGTEMPLATEEX_HDR = struct.Struct('<HHLLLHHHHH') # ver, signature, help_id, ex_style, style, cdit, x, y, cx, cy
+DLGITEMTEMPLATE_HDR = struct.Struct('<LLhhhhH') # style, ex_style, x, y, cx, cy, id
+DLGITEMTEMPLATEEX_HDR = struct.Struct('<LLLhhhhL') # help_id, ex_style, style, x, y, cx, cy, id
+_DOUBLE_NUL_RE = re.compile(rb'\x00\x00') # Literal search (memoryview has no .find())
+
+def _read_unicode_string_align_mv(buf: memoryview, pos: int) -> Tuple[Optional[str], int]:
     """
-    Reads a null-terminated UTF-16LE string from the current stream position
-    and then reads its own DWORD alignment padding.
-    Assumes stream is already positioned at the start of the actual string data or its null terminator.
-    Returns the string, or None if EOF is hit before any characters/terminator are read.
-    Raises EOFError if string is unterminated or padding is incomplete.
+    Reads a null-terminated UTF-16LE string at pos in buf, followed by its own DWORD alignment padding.
+    pos is the start of the actual string data or its null terminator.
+    Returns (string, offset just past the padding), or (None, pos) if the buffer ends before any character.
+    Raises EOFError if the string is unterminated or the padding is incomplete.
     """
-    # This function assumes the stream is positioned exactly at the start of the string data.
-    # It reads characters until a null terminator (b'\x00\x00') or EOF.
-    # Then, it reads necessary padding to align the stream to a DWORD boundary.
-
-    # Get current buffer size once, if possible, for EOF checks.
-    # Fallback if getbuffer() is not available (e.g. some stream types).
-    buffer_len = -1
-    if hasattr(stream, 'getbuffer'):
-        try:
-            buffer_len = len(stream.getbuffer())
-        except Exception: # NOSONAR
-            pass # Keep buffer_len as -1 if getbuffer fails
-
-    print(f"DEBUG_RUSA_UNICODE: Entry. Stream pos: {stream.tell()}, Buffer len: {buffer_len}")
-
-    chars = []
-
-    # Check for immediate EOF before starting loop
-    current_pos = stream.tell()
-    if buffer_len != -1 and current_pos >= buffer_len:
-        print(f"DEBUG_RUSA_UNICODE: Immediate EOF at entry. Stream pos: {current_pos}. Returning None.")
-        return None
-    if buffer_len != -1 and current_pos + 1 >= buffer_len: # Not enough for even one char (2 bytes)
-        print(f"DEBUG_RUSA_UNICODE: Not enough bytes for a char. Stream pos: {current_pos}. Returning None.")
-        return None
-
+    buffer_len = len(buf)
+    if pos + 1 >= buffer_len: # Not enough for even one char (2 bytes)
+        return None, pos
+    # The first b'\x00\x00' at an even offset from pos is the terminator; an odd hit
+    # straddles two code units (e.g. U+0100 followed by "A"), so search on from the next byte
+    search_pos = pos
     while True:
-        print(f"DEBUG_RUSA_UNICODE: String loop top. Stream pos: {stream.tell()}")
-        char_bytes = stream.read(2)
-        print(f"DEBUG_RUSA_UNICODE: String loop. Read 2 bytes. Got: {repr(char_bytes)}, Len: {len(char_bytes) if char_bytes else 0}. Stream pos: {stream.tell()}")
-
-        if not char_bytes or len(char_bytes) < 2: # EOF or short read
-            if chars: # Unterminated string
-                print(f"DEBUG_RUSA_UNICODE: Unterminated string error. Read so far: '{''.join(chars)}'")
-                raise EOFError(f"Unterminated unicode string found. Read: '{''.join(chars)}'. Stream pos: {stream.tell()}")
-            else: # EOF before any character of the string was meaningfully read.
-                print(f"DEBUG_RUSA_UNICODE: String loop. EOF before any char. Returning None.")
-                return None
-
-        if char_bytes == b'\x00\x00': # Null terminator
-            print(f"DEBUG_RUSA_UNICODE: String loop. Null terminator found. Stream pos: {stream.tell()}")
+        nul_match = _DOUBLE_NUL_RE.search(buf, search_pos)
+        if nul_match is None:
+            end = pos + ((buffer_len - pos) & ~1)
+            raise EOFError(f"Unterminated unicode string found. Read: {str(buf[pos:end], 'utf-16-le', 'replace')!r}. Stream pos: {buffer_len}")
+        end = nul_match.start()
+        if not (end - pos) & 1:
             break
-        chars.append(char_bytes.decode('utf-16-le', errors='replace'))
-
-    string_val = "".join(chars)
-    print(f"DEBUG_RUSA_UNICODE: String read: {repr(string_val)}. Stream pos after string+null: {stream.tell()}")
+        search_pos = end + 1
+    string_val = str(buf[pos:end], 'utf-16-le', 'replace')
 
     # Alignment Padding
-    current_pos_after_string_and_null = stream.tell()
-    padding_needed = (4 - (current_pos_after_string_and_null % 4)) % 4
-    print(f"DEBUG_RUSA_UNICODE: Padding needed: {padding_needed}. Stream pos: {current_pos_after_string_and_null}")
-
-    if padding_needed > 0:
-        bytes_available_for_padding = (buffer_len if buffer_len != -1 else current_pos_after_string_and_null) - current_pos_after_string_and_null
-        if buffer_len != -1 : # Recalculate if getbuffer worked
-             bytes_available_for_padding = buffer_len - current_pos_after_string_and_null
-        else: # Estimate, less safe
-             bytes_available_for_padding = padding_needed
-
-        print(f"DEBUG_RUSA_UNICODE: Bytes available for padding: {bytes_available_for_padding}. Stream pos: {stream.tell()}")
-        if bytes_available_for_padding < padding_needed:
-            print(f"DEBUG_RUSA_UNICODE: EOF Error for padding. String: {repr(string_val)}, Needed: {padding_needed}, Available: {bytes_available_for_padding}")
-            raise EOFError(f"EOF: Expected {padding_needed} padding bytes after string {repr(string_val)}, but only {bytes_available_for_padding} available. Stream pos: {current_pos_after_string_and_null}.")
-
-        padding_bytes = stream.read(padding_needed)
-        print(f"DEBUG_RUSA_UNICODE: Read padding bytes. Got: {repr(padding_bytes)}, Len: {len(padding_bytes)}. Stream pos: {stream.tell()}")
-        if len(padding_bytes) < padding_needed: # Should be caught by above, but safeguard
-            raise EOFError(f"EOF: Short read for alignment padding after string {repr(string_val)}. Expected {padding_needed}, got {len(padding_bytes)}. Stream pos: {current_pos_after_string_and_null}.")
-
-    print(f"DEBUG_RUSA_UNICODE: Exit. Returning string: {repr(string_val)}. Stream pos: {stream.tell()}")
-    return string_val
-
-def _read_word_or_string_align(stream: io.BytesIO) -> Tuple[Union[int, str, None], bool]:
+    pos_after_string_and_null = end + 2
+    aligned_pos = (pos_after_string_and_null + 3) & ~3
+    if aligned_pos > buffer_len:
+        raise EOFError(f"EOF: Expected {aligned_pos - pos_after_string_and_null} padding bytes after string {repr(string_val)}, but only {buffer_len - pos_after_string_and_null} available. Stream pos: {pos_after_string_and_null}.")
+    return string_val, aligned_pos
+
+def _read_word_or_string_align_mv(buf: memoryview, pos: int) -> Tuple[Union[int, str, None], bool, int]:
     """
-    Reads a word-sized ordinal or a string from the stream, handling DWORD alignment.
+    Reads a word-sized ordinal or a string at pos in buf, handling DWORD alignment.
     Determines if the field is an atom (0xFFFF), an empty string marker (0x0000),
-    or a string literal. Calls _read_unicode_string_align for string literals.
+    or a string literal; the WORDs are unpacked in place with unpack_from.
 
     Returns:
-        Tuple[Union[int, str, None], bool]:
+        Tuple[Union[int, str, None], bool, int]:
             - The value read (int for atom, str for string, None for EOF at string start).
             - A boolean indicating if the value is a string type (True for string or None-due-to-EOF, False for atom).
-    Raises EOFError for incomplete reads of atoms or markers, or if underlying string read fails.
+            - The offset just past the field and its alignment padding.
+    Raises EOFError for incomplete reads of atoms or markers, or if the string read fails.
     """
-    print(f"DEBUG_RUSA_WOS: Entry. Stream pos: {stream.tell()}, Total size: {len(stream.getbuffer()) if hasattr(stream, 'getbuffer') else 'N/A'}")
-
-    initial_pos_wos = stream.tell()
-
-    # Read the first WORD to determine type
-    first_word_bytes = stream.read(2)
-    if not first_word_bytes or len(first_word_bytes) < 2:
-        print(f"DEBUG_RUSA_WOS: Immediate EOF on first_word read. Stream pos: {stream.tell()}. Returning (None, True)")
-        return None, True # True because None is a valid return for string read attempt
-
-    first_word = struct.unpack('<H', first_word_bytes)[0]
-
-    if first_word == 0xFFFF: # It's an atom (ordinal)
-        print(f"DEBUG_RUSA_WOS: Atom marker 0xFFFF found. Stream pos: {stream.tell()}")
-        id_bytes = stream.read(2)
-        if not id_bytes or len(id_bytes) < 2:
-            print(f"DEBUG_RUSA_WOS: EOF reading atom ID. Stream pos: {stream.tell()}. Raising EOFError.")
-            raise EOFError(f"EOF while reading atom ID after 0xFFFF marker. Stream pos: {stream.tell()}")
-        actual_id = struct.unpack('<H', id_bytes)[0]
-        print(f"DEBUG_RUSA_WOS: Atom ID: {actual_id}. Stream pos: {stream.tell()}. Returning ({actual_id}, False)")
-        return actual_id, False # Value is int, not string
-
-    elif first_word == 0x0000: # Special empty string marker (for dialog menu/class)
-        # This means the string is empty. The 2 bytes b'\x00\x00' have been consumed.
-        # Now we need to handle DWORD alignment for these consumed 2 bytes.
-        print(f"DEBUG_RUSA_WOS: Empty string marker 0x0000 found. Stream pos: {stream.tell()}")
-        current_pos_after_null_marker = stream.tell() # stream is at initial_pos_wos + 2
-        padding_needed = (4 - (current_pos_after_null_marker % 4)) % 4
-        print(f"DEBUG_RUSA_WOS: Empty string marker. Padding needed: {padding_needed}. Stream pos: {current_pos_after_null_marker}")
-        if padding_needed > 0:
-            bytes_available_for_padding = (len(stream.getbuffer()) if hasattr(stream, 'getbuffer') else current_pos_after_null_marker) - current_pos_after_null_marker # Bug here if no getbuffer
-            if hasattr(stream, 'getbuffer'): # Recalculate if getbuffer is available
-                bytes_available_for_padding = len(stream.getbuffer()) - current_pos_after_null_marker
-            else: # Estimate based on assumption that we can read if needed (less safe)
-                bytes_available_for_padding = padding_needed
-            print(f"DEBUG_RUSA_WOS: Empty string marker. Bytes available for padding: {bytes_available_for_padding}.")
-            if bytes_available_for_padding < padding_needed:
-                print(f"DEBUG_RUSA_WOS: Empty string marker. EOF Error for padding. Needed: {padding_needed}, Available: {bytes_available_for_padding}")
-                raise EOFError(f"EOF: Expected {padding_needed} padding bytes after 0x0000 empty string marker, but only {bytes_available_for_padding} available. Stream pos: {current_pos_after_null_marker}.")
-
-            padding_bytes = stream.read(padding_needed)
-            print(f"DEBUG_RUSA_WOS: Empty string marker. Read padding. Got: {repr(padding_bytes)}, Len: {len(padding_bytes)}. Stream pos: {stream.tell()}")
-            if len(padding_bytes) < padding_needed:
-                raise EOFError(f"EOF: Short read for alignment padding after 0x0000 empty string marker. Expected {padding_needed}, got {len(padding_bytes)}. Stream pos: {current_pos_after_null_marker}.")
-        print(f"DEBUG_RUSA_WOS: Empty string marker. Returning \"\". Stream pos: {stream.tell()}")
-        return "", True # Empty string, is_string=True
-
-    else: # It's a string literal. Rewind the 2 bytes we peeked.
-        print(f"DEBUG_RUSA_WOS: Regular string detected. Rewinding from {stream.tell()} to {initial_pos_wos}.")
-        stream.seek(initial_pos_wos)
-        print(f"DEBUG_RUSA_WOS: Calling _read_unicode_string_align. Stream pos: {stream.tell()}")
-        str_val = _read_unicode_string_align(stream)
-        print(f"DEBUG_RUSA_WOS: _read_unicode_string_align returned: {repr(str_val)}. Stream pos: {stream.tell()}. Returning ({repr(str_val)}, True)")
-        return str_val, True # Value is string (or None if EOF at start of string), is_string=True
+    buffer_len = len(buf)
+    if pos + 2 > buffer_len: # Any stray last byte is consumed, as a short read() would
+        return None, True, buffer_len # True because None is a valid return for string read attempt
+
+    first_word = _U16.unpack_from(buf, pos)[0]
+
+    if first_word == 0xFFFF: # It's an atom (ordinal); one unpack gets the marker and the ID
+        if pos + 4 > buffer_len:
+            raise EOFError(f"EOF while reading atom ID after 0xFFFF marker. Stream pos: {buffer_len}")
+        return _2U16.unpack_from(buf, pos)[1], False, pos + 4 # Value is int, not string
+
+    elif first_word == 0x0000: # Special empty string marker (for dialog menu/class), then DWORD alignment
+        pos_after_null_marker = pos + 2
+        aligned_pos = (pos_after_null_marker + 3) & ~3
+        if aligned_pos > buffer_len:
+            raise EOFError(f"EOF: Expected {aligned_pos - pos_after_null_marker} padding bytes after 0x0000 empty string marker, but only {buffer_len - pos_after_null_marker} available. Stream pos: {pos_after_null_marker}.")
+        return "", True, aligned_pos # Empty string, is_string=True
+
+    else: # It's a string literal starting at pos
+        str_val, new_pos = _read_unicode_string_align_mv(buf, pos)
+        return str_val, True, new_pos # Value is string, is_string=True
 
 
 # --- RC Text Parsing and Generation (Simplified for this subtask) ---
+# The RC text is parsed in two layers. _tokenize() is a statement-level lexer: one MULTILINE
+# pattern run with finditer over the whole text, yielding (kind, match) for BEGIN, END,
+# HEADER ("name DIALOG[EX] ..."), KEYWORD (optional statements such as CAPTION) and CONTROL
+# lines. _parse_dialog() then consumes that stream by recursive descent: header and optional
+# statements, then the BEGIN/END control block. Nothing may match across a newline, so
+# whitespace is _SP (which also absorbs the \r of CRLF endings) and quoted text excludes \n.
+# Control parsing is very basic (PUSHBUTTON, LTEXT, EDITTEXT, CONTROL) and will likely
+# miss many valid RC constructs.
+_SP = r'[^\S\n]'
+_STYLE_CHARS = r'[A-Za-z0-9_|+\-#() \t\r\f\v]'
+_STYLE_EXPR = _STYLE_CHARS + '+?' # Non-greedy: the following delimiter ends it, without trailing blanks
+_QSTR_BODY = r'[^"\n]*(?:""[^"\n]*)*' # Contents of a "quoted" RC string ("" is an escaped quote)
+_IDENT = r'[A-Za-z0-9_#.\-+]+'
+_COMMA = rf'{_SP}*,{_SP}*'
+_DIALOG_STATEMENT_RE = re.compile(rf'''
+    ^{_SP}*
+    (?:
+        (?P<BEGIN>BEGIN|\{{){_SP}*$
+      | (?P<END>END|\}}){_SP}*$
+      | (?P<HEADER>
+            (?:"(?P<dialog_name_str>{_QSTR_BODY})"|(?P<dialog_name>{_IDENT})){_SP}+
+            (?P<dialog_type>DIALOGEX|DIALOG)\b(?P<header_args>[^\n]*)
+        )
+      | (?P<KEYWORD>(?P<keyword>CAPTION|STYLE|EXSTYLE|FONT|MENU|CLASS)\b{_SP}*(?P<args>[^\n]*))
+      | (?P<CONTROL>
+            (?P<control_keyword>PUSHBUTTON|LTEXT|EDITTEXT|CONTROL){_SP}+
+            "(?P<text>{_QSTR_BODY})"{_COMMA}
+            (?P<id>{_IDENT}){_COMMA}
+            (?:(?P<class>[A-Za-z0-9_#."]+){_COMMA})?        # Optional class for CONTROL
+            (?P<style>{_STYLE_EXPR}){_COMMA}
+            (?P<x>\d+){_COMMA}(?P<y>\d+){_COMMA}(?P<w>\d+){_COMMA}(?P<h>\d+)
+            (?:{_COMMA}(?P<ex_style>{_STYLE_EXPR})?              # Optional ExStyle, left empty before a help ID
+               (?:{_COMMA}(?P<help_id>{_IDENT}))?)?                # Optional DIALOGEX help ID
+            {_SP}*$
+        )
+    )
+    ''', re.IGNORECASE | re.MULTILINE | re.VERBOSE)
+_CAPTION_ARGS_RE = re.compile(rf'"({_QSTR_BODY})"')
+_STYLE_ARGS_RE = re.compile(rf'{_STYLE_CHARS}+')
+_NAME_ARG_RE = re.compile(rf'"({_QSTR_BODY})"|({_IDENT})')
+_KEYWORD_TO_CLASSNAME = {"EDITTEXT": "EDIT"}
+
+# Style expression tokens: a numeric literal (optional L suffix), a name, an operator, or anything else
+_STYLE_TOKEN_RE = re.compile(r'(0[xX][0-9A-Fa-f]+|\d+)[Ll]?|([A-Za-z_]\w*)|([|+\-()])|(\S)')
+
+def _eval_style(style_str: str) -> int:
+    """
+    Evaluates an RC style expression such as "(WS_CHILD | WS_VISIBLE) | 0x10L" or "WS_CHILD + 1".
+    Terms are numeric literals or known style constants, combined with |, + and -
+    (+ and - bind tighter than |, as in C) and grouped with parentheses.
+    Raises ValueError for anything else.
+    """
+    # Collapse whitespace so equivalent spellings share one cache entry
+    return _eval_normalized_style(" ".join(style_str.split()))
+
+@lru_cache(maxsize=1024)
+def _eval_normalized_style(style_str: str) -> int:
+    tokens: List[Union[int, str, None]] = []
+    for number, name, op, junk in _STYLE_TOKEN_RE.findall(style_str):
+        if junk: raise ValueError(f"Unexpected {junk!r} in style expression {style_str!r}")
+        if op: tokens.append(op)
+        elif number: tokens.append(_rc_int(number))
+        else:
+            flag = _STYLE_CONSTANTS.get(name)
+            if flag is None: raise ValueError(f"Unknown style name {name!r} in {style_str!r}")
+            tokens.append(flag)
+    tokens.append(None) # End marker, so the parsers below can always look one token ahead
+    value, pos = _eval_style_or(tokens, 0)
+    if tokens[pos] is not None: raise ValueError(f"Unexpected {tokens[pos]!r} in style expression {style_str!r}")
+    return value & 0xFFFFFFFF # Styles are DWORDs; "-1" and the like wrap as they do in rc
+
+def _eval_style_or(tokens: List[Union[int, str, None]], pos: int) -> Tuple[int, int]:
+    """term ('|' term)*. Returns (value, position of the next token)."""
+    value, pos = _eval_style_sum(tokens, pos)
+    while tokens[pos] == "|":
+        rhs, pos = _eval_style_sum(tokens, pos + 1)
+        value |= rhs
+    return value, pos
+
+def _eval_style_sum(tokens: List[Union[int, str, None]], pos: int) -> Tuple[int, int]:
+    """unary (('+' | '-') unary)*."""
+    value, pos = _eval_style_unary(tokens, pos)
+    while tokens[pos] in ("+", "-"):
+        op = tokens[pos]
+        rhs, pos = _eval_style_unary(tokens, pos + 1)
+        value = value + rhs if op == "+" else value - rhs
+    return value, pos
+
+def _eval_style_unary(tokens: List[Union[int, str, None]], pos: int) -> Tuple[int, int]:
+    """'-' unary | '(' expression ')' | literal or name."""
+    token = tokens[pos]
+    if token == "-":
+        value, pos = _eval_style_unary(tokens, pos + 1)
+        return -value, pos
+    if token == "(":
+        value, pos = _eval_style_or(tokens, pos + 1)
+        if tokens[pos] != ")": raise ValueError("Unbalanced '(' in style expression")
+        return value, pos + 1
+    if type(token) is not int: raise ValueError(f"Expected a style term, got {token!r}") # Empty terms, stray ')'
+    return token, pos + 1
+
+def _tokenize(rc_text: str) -> Iterator[Tuple[str, "re.Match[str]"]]:
+    """Yields (kind, match) for each recognised statement line; other lines are skipped."""
+    for match in _DIALOG_STATEMENT_RE.finditer(rc_text):
+        yield match.lastgroup, match
+
+# RC numeric literal: optional minus, decimal or 0x/0X hex digits, optional L suffix. Checked before
+# int() so Python-only spellings (1_0, 0o7, +5) are not taken for numbers.
+_RC_INT_RE = re.compile(r'(-?)(?:0[xX]([0-9A-Fa-f]+)|([0-9]+))[Ll]?')
+
+def _rc_int(value: str) -> int:
+    """Parses an RC numeric literal (decimal or 0x hex, optional L suffix). Raises ValueError."""
+    match = _RC_INT_RE.fullmatch(value.strip())
+    if match is None: raise ValueError(f"Not an RC number: {value!r}")
+    sign, hex_digits, dec_digits = match.groups()
+    number = int(hex_digits, 16) if hex_digits is not None else int(dec_digits)
+    return -number if sign else number
+
+def _parse_name_or_ordinal(quoted: Optional[str], bare: str) -> Tuple[Union[int, str], Optional[str]]:
+    """Returns (value, symbolic name) for a dialog/menu/class reference: "Name", 101 or IDD_NAME."""
+    if quoted is not None: return quoted.replace('""','"'), None
+    try: return _rc_int(bare), None
+    except ValueError: return sys.intern(bare), bare
+
+def _parse_dialog_header(match: "re.Match[str]", props: DialogProperties) -> None:
+    """Parses 'name DIALOG[EX] x, y, width, height [, helpID]'."""
+    props.name, props.symbolic_name = _parse_name_or_ordinal(match.group("dialog_name_str"), match.group("dialog_name"))
+    props.is_ex = match.group("dialog_type").upper() == "DIALOGEX"
+    header_args = match.group("header_args").split("//", 1)[0]
+    try:
+        values = [_rc_int(value) for value in header_args.split(",")]
+        props.x, props.y, props.width, props.height = values[:4]
+        if props.is_ex and len(values) > 4: props.help_id = values[4]
+    except ValueError:
+        print(f"Warning: Could not parse dialog header: {match.group('HEADER').strip()}")
+
+def _control_from_match(match: "re.Match[str]") -> DialogControlEntry:
+    keyword, text, id_str, class_name_rc, style_str, x, y, w, h, ex_style_str, help_id_str = match.group(
+        "control_keyword", "text", "id", "class", "style", "x", "y", "w", "h", "ex_style", "help_id")
+    text = text.replace('""','"')
+    id_val: Union[str,int]
+    try: id_val = _rc_int(id_str) # Decimal, 0x hex or negative literals such as IDC_STATIC's -1
+    except ValueError: id_val = sys.intern(id_str) # Symbolic ids such as IDC_STATIC repeat across controls
+
+    style_val = 0; ex_style_val = 0
+    try: style_val = _eval_style(style_str)
+    except ValueError: pass # print(f"Warning: Could not eval control STYLE: {style_str}")
+    if ex_style_str:
+        try: ex_style_val = _eval_style(ex_style_str)
+        except ValueError: pass # print(f"Warning: Could not eval control EXSTYLE: {ex_style_str}")
+    help_id_val = 0
+    if help_id_str:
+        try: help_id_val = _rc_int(help_id_str)
+        except ValueError: pass # Symbolic help IDs are not resolved
+
+    keyword_upper = keyword.upper()
+    if keyword_upper == "CONTROL" and class_name_rc:
+        final_class_name = sys.intern(class_name_rc.strip('"'))
+    else: # Default for LTEXT, PUSHBUTTON etc.
+        final_class_name = _KEYWORD_TO_CLASSNAME.get(keyword_upper) or sys.intern(keyword_upper)
+
+    return DialogControlEntry(final_class_name, text, id_val, int(x),int(y),int(w),int(h), style=style_val, ex_style=ex_style_val, help_id=help_id_val)
+
+def _parse_control_block(tokens: Iterator[Tuple[str, "re.Match[str]"]], controls: List[DialogControlEntry]) -> None:
+    """Consumes control statements up to the END that closes an already-consumed BEGIN."""
+    for kind, match in tokens:
+        if kind == "END": return
+        if kind == "CONTROL": controls.append(_control_from_match(match))
+
+def _parse_caption_prop(args: str, props: DialogProperties) -> None:
+    caption_match = _CAPTION_ARGS_RE.match(args)
+    if caption_match: props.caption = caption_match.group(1).replace('""','"')
+
+def _parse_style_expr(keyword: str, args: str) -> Optional[int]:
+    style_match = _STYLE_ARGS_RE.match(args)
+    style_str = style_match.group().rstrip() if style_match else args
+    try: return _eval_style(style_str)
+    except ValueError: print(f"Warning: Could not eval dialog {keyword}: {style_str}")
+    return None
+
+def _parse_style_prop(args: str, props: DialogProperties) -> None:
+    style = _parse_style_expr("STYLE", args)
+    if style is not None: props.style = style
+
+def _parse_exstyle_prop(args: str, props: DialogProperties) -> None:
+    ex_style = _parse_style_expr("EXSTYLE", args)
+    if ex_style is not None: props.ex_style = ex_style
+
+def _parse_font_prop(args: str, props: DialogProperties) -> None:
+    # FONT size, "name" [, weight, italic, charset]: peel fields off with partition
+    size_str, sep, rest = args.partition(",")
+    name_str, _, rest = rest.partition(",")
+    try:
+        if not sep: raise ValueError("FONT needs a size and a name")
+        props.font_size = _rc_int(size_str)
+        props.font_name = name_str.strip().strip('"')
+        if rest:
+            weight_str, _, rest = rest.partition(",")
+            props.font_weight = _rc_int(weight_str)
+        if rest:
+            italic_str, _, rest = rest.partition(",")
+            props.font_italic = bool(_rc_int(italic_str))
+        if rest:
+            props.font_charset = _rc_int(rest.partition(",")[0])
+    except ValueError: print(f"Warning: Could not parse dialog FONT: {args}")
+
+def _parse_menu_prop(args: str, props: DialogProperties) -> None:
+    name_match = _NAME_ARG_RE.match(args)
+    if name_match: props.menu_name, props.symbolic_menu_name = _parse_name_or_ordinal(*name_match.groups())
+
+def _parse_class_prop(args: str, props: DialogProperties) -> None:
+    name_match = _NAME_ARG_RE.match(args)
+    if name_match: props.class_name, props.symbolic_class_name = _parse_name_or_ordinal(*name_match.groups())
+
+# Optional-statement keyword (as matched by the KEYWORD token, upper-cased) -> handler(args, props)
+_DIALOG_PROPERTY_PARSERS = {
+    "CAPTION": _parse_caption_prop, "STYLE": _parse_style_prop, "EXSTYLE": _parse_exstyle_prop,
+    "FONT": _parse_font_prop, "MENU": _parse_menu_prop, "CLASS": _parse_class_prop,
+}
+
+def _parse_dialog(tokens: Iterator[Tuple[str, "re.Match[str]"]]) -> Tuple[DialogProperties, List[DialogControlEntry]]:
+    props = DialogProperties(name="PARSED_DIALOG_NAME_FROM_RC", caption="Parsed Dialog (RC Text - Simplified)")
+    controls: List[DialogControlEntry] = []
+
+    # Header line and optional statements, up to the first BEGIN
+    for kind, match in tokens:
+        if kind == "BEGIN":
+            _parse_control_block(tokens, controls)
+            break
+        if kind == "HEADER":
+            _parse_dialog_header(match, props)
+        elif kind == "KEYWORD":
+            _DIALOG_PROPERTY_PARSERS[match.group("keyword").upper()](match.group("args"), props)
+
+    # Any further BEGIN/END blocks still contribute controls, as the line scanner always allowed
+    for kind, match in tokens:
+        if kind == "BEGIN": _parse_control_block(tokens, controls)
+    return props, controls
+
 def parse_dialog_rc_text(rc_text: str) -> Tuple[Optional[DialogProperties], List[DialogControlEntry]]:
     # ... (Implementation remains simplified as primary focus is binary parsing for this subtask) ...
     print("Warning: RC text parsing for dialogs is simplified. Complex dialogs may not parse fully.")
-    props = DialogProperties(name="PARSED_DIALOG_NAME_FROM_RC", caption="Parsed Dialog (RC Text - Simplified)")
-    controls = []
-    # Basic CAPTION parsing
-    cap_match = re.search(r'CAPTION\s+"([^"]*(?:""[^"]*)*)"', rc_text, re.IGNORECASE)
-    if cap_match: props.caption = cap_match.group(1).replace('""','"')
-
-    # Basic STYLE parsing
-    style_match = re.search(r'STYLE\s+([A-Za-z0-9_\|\s\+\-\#\(\)]+)', rc_text, re.IGNORECASE)
-    if style_match:
-        try: props.style = eval(style_match.group(1).replace("|","|")) # Basic eval
-        except: print(f"Warning: Could not eval dialog STYLE: {style_match.group(1)}")
-
-    # Very basic control parsing (example for PUSHBUTTON, LTEXT, EDITTEXT, CONTROL)
-    # This regex is very naive and will likely miss many valid RC constructs.
-    control_pattern = re.compile(
-        r'^\s*(PUSHBUTTON|LTEXT|EDITTEXT|CONTROL)\s+' # Keyword
-        r'"([^"]*(?:""[^"]*)*)"\s*,\s*' # Text
-        r'([A-Za-z0-9_#\.\-\+]+)\s*,\s*' # ID
-        r'(?:([A-Za-z0-9_#\."]+)\s*,\s*)?' # Optional Class for CONTROL
-        r'([A-Za-z0-9_\|\s\+\-\#\(\)]+)\s*,\s*' # Style
-        r'(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)' # x, y, w, h
-        r'(?:\s*,\s*([A-Za-z0-9_\|\s\+\-\#\(\)]+))?\s*$', # Optional ExStyle
-        re.IGNORECASE
-    )
-    in_begin_end = False
-    for line in rc_text.splitlines():
-        line = line.strip()
-        if line.upper() == "BEGIN": in_begin_end = True; continue
-        if line.upper() == "END": in_begin_end = False; continue
-        if not in_begin_end or line.startswith("//"): continue
-
-        match = control_pattern.match(line)
-        if match:
-            keyword, text, id_str, class_name_rc, style_str, x, y, w, h, ex_style_str = match.groups()
-            text = text.replace('""','"')
-            id_val: Union[str,int] = id_str
-            if id_str.isdigit() or id_str.startswith("0x"): id_val = int(id_str,0)
-
-            style_val = 0; ex_style_val = 0
-            try: style_val = eval(style_str.replace("|","|"))
-            except: pass # print(f"Warning: Could not eval control STYLE: {style_str}")
-            if ex_style_str:
-                try: ex_style_val = eval(ex_style_str.replace("|","|"))
-                except: pass # print(f"Warning: Could not eval control EXSTYLE: {ex_style_str}")
-
-            final_class_name = keyword.upper() # Default for LTEXT, PUSHBUTTON etc.
-            if keyword.upper() == "CONTROL" and class_name_rc:
-                final_class_name = class_name_rc.strip('"')
-            elif keyword.upper() == "EDITTEXT": final_class_name = "EDIT"
-
-            controls.append(DialogControlEntry(final_class_name, text, id_val, int(x),int(y),int(w),int(h), style=style_val, ex_style=ex_style_val))
-    return props, controls
+    return _parse_dialog(_tokenize(rc_text))
+
+
+_QUOTE_ESCAPE = str.maketrans({'"': '""'}) # RC strings escape a quote by doubling it
+
+# RC keyword for each button type (the BS_TYPEMASK nibble of the style). BS_USERBUTTON,
+# BS_OWNERDRAW and the undefined values have no keyword and stay CONTROL "Button".
+_BUTTON_KIND: List[Optional[str]] = [None] * 16
+for _bs_type, _keyword in ((BS_PUSHBUTTON, "PUSHBUTTON"), (BS_DEFPUSHBUTTON, "DEFPUSHBUTTON"),
+                           (BS_CHECKBOX, "CHECKBOX"), (BS_AUTOCHECKBOX, "AUTOCHECKBOX"),
+                           (BS_RADIOBUTTON, "RADIOBUTTON"), (BS_3STATE, "STATE3"), (BS_AUTO3STATE, "AUTO3STATE"),
+                           (BS_GROUPBOX, "GROUPBOX"), (BS_AUTORADIOBUTTON, "AUTORADIOBUTTON")):
+    _BUTTON_KIND[_bs_type] = _keyword
+del _bs_type, _keyword
+
+def _button_atom_keyword(style: int) -> Tuple[str, str]:
+    button_keyword = _BUTTON_KIND[style & 0x0F]
+    if button_keyword: return button_keyword, ""
+    return "CONTROL", '"BUTTON"'
+
+# RC keyword for the low nibble of a STATIC style. Basic SS_LEFT, SS_CENTER, SS_RIGHT give LTEXT,
+# CTEXT, RTEXT; any nibble containing the SS_ICON bits is ICON ("" or an id). Other types, such as
+# SS_BLACKRECT, stay CONTROL "Static".
+_STATIC_KIND: List[Optional[str]] = [None] * 16
+_STATIC_KIND[SS_LEFT], _STATIC_KIND[SS_CENTER], _STATIC_KIND[SS_RIGHT] = "LTEXT", "CTEXT", "RTEXT"
+for _ss_type in range(16):
+    if (_ss_type & SS_ICON) == SS_ICON: _STATIC_KIND[_ss_type] = "ICON"
+del _ss_type
+
+def _static_atom_keyword(style: int) -> Tuple[str, str]:
+    static_keyword = _STATIC_KIND[style & 0x0F]
+    if static_keyword: return static_keyword, ""
+    return "CONTROL", '"STATIC"'
+
+# RC keyword per predefined atom: a fixed (rc_keyword, quoted class name for CONTROL) pair,
+# or a function of the style for classes whose keyword depends on the control type.
+# This is a simplified mapping. More specific mappings might be needed.
+_ATOM_KEYWORD = {
+    BUTTON_ATOM: _button_atom_keyword,
+    EDIT_ATOM: ("EDITTEXT", ""),
+    STATIC_ATOM: _static_atom_keyword,
+    LISTBOX_ATOM: ("LISTBOX", ""),
+    SCROLLBAR_ATOM: ("SCROLLBAR", ""),
+    COMBOBOX_ATOM: ("COMBOBOX", ""),
+}
 
+@lru_cache(maxsize=256)
+def _quoted_atom(atom: int) -> str:
+    """CONTROL class operand for an atom with no class name; dialogs only use a handful of those."""
+    return f'"0x{atom:X}"'
 
-def generate_dialog_rc_text(dialog_props: DialogProperties, controls: List[DialogControlEntry], lang_id: Optional[int] = None) -> str:
+def _atom_control_keyword(atom: int, style: int) -> Tuple[str, str, Optional[str]]:
+    """
+    Picks the RC keyword for a control whose class is an atom.
+    Returns (rc_keyword, quoted class name for CONTROL or "", STYLE_TO_STR_MAP_BY_CLASS key).
+    """
+    keyword = _ATOM_KEYWORD.get(atom)
+    if keyword is None: # Unknown atom
+        return "CONTROL", _quoted_atom(atom), None
+    rc_keyword, class_name_for_rc = keyword if type(keyword) is tuple else keyword(style)
+    return rc_keyword, class_name_for_rc, ATOM_TO_CLASSNAME_MAP[atom]
+
+# String class names that have a simpler RC keyword, by lowercased name (RC class names are
+# case-insensitive). The value is the keyword, or a function of the style returning it or None.
+# Example: "RichEdit20W" is not listed and would use CONTROL "RichEdit20W"
+# ... (add other string class names if they map to simple keywords) ...
+_STRING_CLASS_KEYWORD = {
+    "button": lambda style: _BUTTON_KIND[style & 0x0F],
+    "edit": "EDITTEXT",
+}
+
+def _string_control_keyword(class_name: str, style: int) -> Tuple[str, str, Optional[str]]:
+    """String-class counterpart of _atom_control_keyword."""
+    rc_keyword = _STRING_CLASS_KEYWORD.get(class_name.lower())
+    if rc_keyword is not None and type(rc_keyword) is not str: rc_keyword = rc_keyword(style)
+    if rc_keyword: return rc_keyword, "", class_name
+    return "CONTROL", f'"{class_name}"', class_name # Default to CONTROL "ClassName"
+
+_CONTROL_KEYWORD_BY_CLASS_TYPE = {int: _atom_control_keyword, str: _string_control_keyword}
+
+# Dialog name as written in the header: symbolic name, else quoted string name or bare ordinal
+_NAME_FMT = {
+    str: lambda name, symbolic: symbolic or f'"{name}"',
+    int: lambda name, symbolic: symbolic or str(name),
+}
+
+# _format_style_flags_cached map names for a control, by STYLE_TO_STR_MAP_BY_CLASS key.
+# Always include general WS_; built once here rather than as a new tuple per control.
+_DEFAULT_CONTROL_STYLE_MAP_KEYS = ("GENERAL_WS",)
+_CONTROL_STYLE_MAP_KEYS = {class_key: ("GENERAL_WS", class_key) for class_key in STYLE_TO_STR_MAP_BY_CLASS}
+
+# Style bits the resource compiler adds by itself to LTEXT, PUSHBUTTON, EDITTEXT... statements.
+# CONTROL lines always spell out their full style, so those are left alone.
+_IMPLICIT_CTRL_STYLE_MASK = WS_CHILD | WS_VISIBLE
+_IMPLICIT_CTRL_STYLE_NAMES = frozenset(("WS_CHILD", "WS_VISIBLE"))
+
+@lru_cache(maxsize=4096)
+def _format_keyword_ctrl_style(style_value: int, map_keys: Tuple[str, ...]) -> str:
+    """
+    _format_style_flags_cached for a keyword statement whose style has both implicit bits set:
+    the WS_CHILD and WS_VISIBLE names are left out, while composite names that include
+    one of those bits (LBS_STANDARD) are kept.
+    """
+    flag_names = _format_style_flags_cached(style_value, map_keys).split(" | ")
+    return " | ".join(name for name in flag_names if name not in _IMPLICIT_CTRL_STYLE_NAMES)
+
+# DIALOGEX control trailer by (style written, ex_style != 0, help_id != 0), appended after the
+# optional style. Omitted fields before a written one are left empty, so the positions still line up.
+_DIALOGEX_TRAILER = {
+    (False, False, False): "",                (True, False, False): "",
+    (False, True, False): ",, {ex}",          (True, True, False): ", {ex}",
+    (False, False, True): ",,, {help}",       (True, False, True): ",, {help}",
+    (False, True, True): ",, {ex}, {help}",   (True, True, True): ", {ex}, {help}",
+}
+
+def _emit_control_line(ctrl: DialogControlEntry) -> Tuple[str, bool]:
+    """
+    Formats the part of a control statement shared by DIALOG and DIALOGEX, up to the style.
+    Returns (line, whether a style was written).
+    """
+    text_disp = f'"{ctrl.text.translate(_QUOTE_ESCAPE)}"'
+
+    id_disp = ctrl.get_id_display()
+    class_name, style = ctrl.class_name, ctrl.style # Read once; the helpers below take plain values
+
+    # Class names are atoms (int) or strings; dispatch once on the type instead of re-testing isinstance
+    keyword_for_class = _CONTROL_KEYWORD_BY_CLASS_TYPE.get(type(class_name))
+    rc_keyword, class_name_for_rc, maps_key = keyword_for_class(class_name, style) if keyword_for_class else ("CONTROL", "", None)
+
+    # Determine relevant style maps for the formatters
+    current_style_maps = _CONTROL_STYLE_MAP_KEYS.get(maps_key, _DEFAULT_CONTROL_STYLE_MAP_KEYS)
+    geometry = f"{ctrl.x}, {ctrl.y}, {ctrl.width}, {ctrl.height}"
+
+    if rc_keyword == "CONTROL":
+        # CONTROL text, id, class, style, x, y, width, height: the style is a required operand and
+        # keeps WS_CHILD | WS_VISIBLE, so a zero style is written as "0" rather than left out.
+        ctrl_style_str = _format_style_flags_cached(style, current_style_maps)
+        class_seg = f", {class_name_for_rc}" if class_name_for_rc else ""
+        return f"    CONTROL {text_disp}, {id_disp}{class_seg}, {ctrl_style_str}, {geometry}", True
+
+    if style == _IMPLICIT_CTRL_STYLE_MASK or not style:
+        # Fast path for the bulk of plain LTEXT, EDITTEXT, PUSHBUTTON...: a zero type field (SS_LEFT,
+        # ES_LEFT, BS_PUSHBUTTON) is what the keyword already says, so there is no style to write.
+        ctrl_style_str = ""
+    elif (style & _IMPLICIT_CTRL_STYLE_MASK) != _IMPLICIT_CTRL_STYLE_MASK:
+        # A hidden or non-child control: write every bit, so the difference shows in the output
+        ctrl_style_str = _format_style_flags_cached(style, current_style_maps)
+    else:
+        ctrl_style_str = _format_keyword_ctrl_style(style, current_style_maps)
+
+    # Keyword statements take an optional style after the geometry
+    has_style = bool(ctrl_style_str) and ctrl_style_str != "0"
+    style_seg = f", {ctrl_style_str}" if has_style else ""
+    return f"    {rc_keyword} {text_disp}, {id_disp}, {geometry}{style_seg}", has_style
+
+def _emit_control_classic(ctrl: DialogControlEntry) -> str:
+    """Formats one control as a DIALOG statement line."""
+    return _emit_control_line(ctrl)[0]
+
+def _emit_control_ex(ctrl: DialogControlEntry) -> str:
+    """Formats one control as a DIALOGEX statement line."""
+    line, has_style = _emit_control_line(ctrl)
+    ex_style, help_id = ctrl.ex_style, ctrl.help_id
+    has_ex = ex_style != 0
+    ex_style_str = _format_style_flags_cached(ex_style, ("EXSTYLE",)) if has_ex else ""
+    trailer = _DIALOGEX_TRAILER[has_style, has_ex, help_id != 0]
+    if trailer: line += trailer.format(ex=ex_style_str, help=help_id)
+    return line
+
+
+def write_dialog_rc_text(out: TextIO, dialog_props: DialogProperties, controls: List[DialogControlEntry], lang_id: Optional[int] = None) -> None:
+    """
+    Writes the dialog as RC text to out, line by line, so a large dump is never held
+    in memory twice. The text ends at END, without a newline.
+    """
     # ... (Implementation remains simplified) ...
-    lines: List[str] = []
-    if lang_id is not None: lines.append(f"LANGUAGE {lang_id & 0x3FF}, {(lang_id >> 10) & 0x3F}")
-    name_str = dialog_props.symbolic_name or str(dialog_props.name)
-    if isinstance(dialog_props.name, str) and not dialog_props.symbolic_name: name_str = f'"{dialog_props.name}"'
+    write = out.write
+    if lang_id is not None: write(f"LANGUAGE {lang_id & 0x3FF}, {(lang_id >> 10) & 0x3F}\n")
+    name_str = _NAME_FMT.get(type(dialog_props.name), _NAME_FMT[int])(dialog_props.name, dialog_props.symbolic_name)
     dialog_type = "DIALOGEX" if dialog_props.is_ex else "DIALOG"
-    lines.append(f"{name_str} {dialog_type} {dialog_props.x}, {dialog_props.y}, {dialog_props.width}, {dialog_props.height}")
+    write(f"{name_str} {dialog_type} {dialog_props.x}, {dialog_props.y}, {dialog_props.width}, {dialog_props.height}\n")
 
     # Convert dialog styles to string representations
-    dialog_style_str = _format_style_flags(dialog_props.style, [STYLE_TO_STR_MAP_BY_CLASS["GENERAL_DS"], STYLE_TO_STR_MAP_BY_CLASS["GENERAL_WS"]])
+    dialog_style_str = _format_style_flags_cached(dialog_props.style, ("GENERAL_DS", "GENERAL_WS"))
     if dialog_style_str and dialog_style_str != "0": # Only add STYLE if it's not zero or default
-        lines.append(f"STYLE {dialog_style_str}")
+        write(f"STYLE {dialog_style_str}\n")
 
     if dialog_props.ex_style: # EXSTYLE is only added if non-zero
-        dialog_ex_style_str = _format_style_flags(dialog_props.ex_style, [EXSTYLE_TO_STR_MAP])
-        lines.append(f"EXSTYLE {dialog_ex_style_str}")
+        dialog_ex_style_str = _format_style_flags_cached(dialog_props.ex_style, ("EXSTYLE",))
+        write(f"EXSTYLE {dialog_ex_style_str}\n")
 
     if dialog_props.caption:
-        caption = dialog_props.caption.replace('"', '""')
-        lines.append(f'CAPTION "{caption}"')
+        write(f'CAPTION "{dialog_props.caption.translate(_QUOTE_ESCAPE)}"\n')
 
     if dialog_props.font_size and dialog_props.font_name:
         font_extra = f", {dialog_props.font_weight}, {1 if dialog_props.font_italic else 0}, 0x{dialog_props.font_charset:X}" if dialog_props.is_ex else ""
-        lines.append(f'FONT {dialog_props.font_size}, "{dialog_props.font_name}"{font_extra}')
-    lines.append("BEGIN")
+        write(f'FONT {dialog_props.font_size}, "{dialog_props.font_name}"{font_extra}\n')
+    write("BEGIN\n")
+    emit_control = _emit_control_ex if dialog_props.is_ex else _emit_control_classic
     for ctrl in controls:
-        text = ctrl.text.replace('"', '""')
-        text_disp = f'"{text}"'
-
-        id_disp = ctrl.get_id_display()
-
-        rc_keyword = "CONTROL" # Default
-        class_name_for_rc = ""
-
-        # Determine specific RC keyword if possible
-        # This is a simplified mapping. More specific mappings might be needed.
-        # Order of checks can be important if a class can map to multiple keywords based on style.
-        if isinstance(ctrl.class_name, int): # Atom
-            if ctrl.class_name == BUTTON_ATOM:
-                if (ctrl.style & BS_PUSHBUTTON) == BS_PUSHBUTTON: rc_keyword = "PUSHBUTTON"
-                elif (ctrl.style & BS_DEFPUSHBUTTON) == BS_DEFPUSHBUTTON: rc_keyword = "DEFPUSHBUTTON"
-                elif (ctrl.style & BS_CHECKBOX) == BS_CHECKBOX: rc_keyword = "CHECKBOX"
-                elif (ctrl.style & BS_AUTOCHECKBOX) == BS_AUTOCHECKBOX: rc_keyword = "AUTOCHECKBOX" # Often just CHECKBOX with style
-                elif (ctrl.style & BS_RADIOBUTTON) == BS_RADIOBUTTON: rc_keyword = "RADIOBUTTON"
-                elif (ctrl.style & BS_AUTORADIOBUTTON) == BS_AUTORADIOBUTTON: rc_keyword = "AUTORADIOBUTTON" # Often just RADIOBUTTON
-                elif (ctrl.style & BS_GROUPBOX) == BS_GROUPBOX: rc_keyword = "GROUPBOX"
-                # Add BS_OWNERDRAW, BS_USERBUTTON etc. if they should have specific keywords or stay CONTROL
-                else: class_name_for_rc = f'"{ATOM_TO_CLASSNAME_MAP.get(ctrl.class_name, str(ctrl.class_name))}"'
-            elif ctrl.class_name == EDIT_ATOM: rc_keyword = "EDITTEXT"
-            elif ctrl.class_name == STATIC_ATOM:
-                # Basic SS_LEFT, SS_CENTER, SS_RIGHT for LTEXT, CTEXT, RTEXT
-                # Exact matching for SS_ICON, SS_BLACKRECT etc. might be better with CONTROL "Static"
-                if (ctrl.style & 0x0F) == SS_LEFT: rc_keyword = "LTEXT" # Check only horizontal alignment part
-                elif (ctrl.style & 0x0F) == SS_CENTER: rc_keyword = "CTEXT"
-                elif (ctrl.style & 0x0F) == SS_RIGHT: rc_keyword = "RTEXT"
-                elif (ctrl.style & SS_ICON) == SS_ICON: rc_keyword = "ICON" # ICON "" or ICON id
-                else: class_name_for_rc = f'"{ATOM_TO_CLASSNAME_MAP.get(ctrl.class_name, str(ctrl.class_name))}"'
-            elif ctrl.class_name == LISTBOX_ATOM: rc_keyword = "LISTBOX"
-            elif ctrl.class_name == SCROLLBAR_ATOM: rc_keyword = "SCROLLBAR"
-            elif ctrl.class_name == COMBOBOX_ATOM: rc_keyword = "COMBOBOX"
-            else: # Unknown atom
-                class_name_for_rc = f'"0x{ctrl.class_name:X}"'
-        elif isinstance(ctrl.class_name, str):
-            # For known string class names, decide if they have a simpler RC keyword
-            # Example: "RichEdit20W" would use CONTROL "RichEdit20W"
-            if ctrl.class_name.upper() == "BUTTON": # String "Button"
-                 if (ctrl.style & BS_PUSHBUTTON) == BS_PUSHBUTTON: rc_keyword = "PUSHBUTTON"
-                 # ... (add other BS_ types as above) ...
-                 else: class_name_for_rc = f'"{ctrl.class_name}"'
-            elif ctrl.class_name.upper() == "EDIT": rc_keyword = "EDITTEXT"
-            # ... (add other string class names if they map to simple keywords) ...
-            else: # Default to CONTROL "ClassName"
-                class_name_for_rc = f'"{ctrl.class_name}"'
-
-        # Determine relevant style maps for _format_style_flags
-        current_style_maps = [STYLE_TO_STR_MAP_BY_CLASS["GENERAL_WS"]] # Always include general WS_
-        if isinstance(ctrl.class_name, int) and ctrl.class_name in ATOM_TO_CLASSNAME_MAP:
-            maps_key = ATOM_TO_CLASSNAME_MAP[ctrl.class_name]
-            if maps_key in STYLE_TO_STR_MAP_BY_CLASS:
-                current_style_maps.append(STYLE_TO_STR_MAP_BY_CLASS[maps_key])
-        elif isinstance(ctrl.class_name, str) and ctrl.class_name in STYLE_TO_STR_MAP_BY_CLASS:
-             current_style_maps.append(STYLE_TO_STR_MAP_BY_CLASS[ctrl.class_name])
-
-        # Remove WS_CHILD from style for RC text as it's implied by being a control
-        # However, ensure it's handled if other style calculation relies on it being there before formatting.
-        # For now, let _format_style_flags handle it based on the map.
-        # If WS_CHILD is in GENERAL_WS map, it will be added if present.
-        # Typically, WS_VISIBLE is also there.
-        ctrl_style_str = _format_style_flags(ctrl.style, current_style_maps)
-
-        line_parts = [f"    {rc_keyword} {text_disp}, {id_disp}"]
-        if class_name_for_rc: # Only for CONTROL keyword
-            line_parts.append(f", {class_name_for_rc}")
-
-        line_parts.append(f", {ctrl.x}, {ctrl.y}, {ctrl.width}, {ctrl.height}")
-
-        if ctrl_style_str and ctrl_style_str != "0": # Only add style string if not default/zero
-            # For some keywords like LTEXT, PUSHBUTTON, style is often omitted if default for that type.
-            # This simple check adds it if _format_style_flags produced something other than "0".
-            line_parts.append(f", {ctrl_style_str}")
-
-        if dialog_props.is_ex:
-            if ctrl.ex_style != 0:
-                ex_style_str = _format_style_flags(ctrl.ex_style, [EXSTYLE_TO_STR_MAP])
-                # Need to ensure preceding comma if style was omitted
-                if not (ctrl_style_str and ctrl_style_str != "0"): line_parts.append(",")
-                line_parts.append(f", {ex_style_str}")
-            if ctrl.help_id != 0:
-                # Ensure preceding commas if style/ex_style were omitted
-                if not (ctrl_style_str and ctrl_style_str != "0") and ctrl.ex_style == 0 : line_parts.append(",,")
-                elif not (ctrl_style_str and ctrl_style_str != "0") or ctrl.ex_style == 0 : line_parts.append(",")
-                line_parts.append(f", {ctrl.help_id}")
-
-        lines.append("".join(line_parts))
-    lines.append("END")
-    return "\n".join(lines)
+        write(emit_control(ctrl)); write("\n")
+    write("END")
+
+def generate_dialog_rc_text(dialog_props: DialogProperties, controls: List[DialogControlEntry], lang_id: Optional[int] = None) -> str:
+    """write_dialog_rc_text into a string."""
+    out = io.StringIO()
+    write_dialog_rc_text(out, dialog_props, controls, lang_id)
+    return out.getvalue()
 
 
-if __name__ == '__main__':
+def _self_test() -> None:
     print("Testing dialog_parser_util.py with constants and binary helpers.")
-    # ... (tests from previous step can be kept or adapted) ...
+    sample_dialog_rc = (
+        'IDD_SAMPLE DIALOGEX 0, 0, 200, 100\n'
+        'STYLE DS_MODALFRAME | WS_POPUP | WS_CAPTION\n'
+        'CAPTION "Sample ""Dialog"""\n'
+        'BEGIN\n'
+        '    EDITTEXT "", 1001, ES_AUTOHSCROLL | WS_BORDER, 10, 10, 100, 14\n'
+        '    CONTROL "List", IDC_LIST, "SysListView32", LVS_REPORT | WS_TABSTOP, 10, 30, 100, 50\n'
+        'END\n'
+    )
+    props, controls = parse_dialog_rc_text(sample_dialog_rc)
+    assert props is not None and props.caption == 'Sample "Dialog"', props
+    assert props.style == DS_MODALFRAME | WS_POPUP | WS_CAPTION, hex(props.style)
+    assert [c.class_name for c in controls] == ["EDIT", WC_LISTVIEW], controls
+    assert [c.id_val for c in parse_dialog_rc_text(
+        'X DIALOG 0, 0, 9, 9\nBEGIN\n    LTEXT "", -1, 0, 1, 1, 1, 1\n    LTEXT "", 0X1F, 0, 1, 1, 1, 1\n'
+        '    LTEXT "", 1_0, 0, 1, 1, 1, 1\n    LTEXT "", IDC_1_0, 0, 1, 1, 1, 1\nEND')[1]] == [-1, 0x1F, "1_0", "IDC_1_0"]
+    print(generate_dialog_rc_text(props, controls))
+
+    # CONTROL lines carry their full style before the geometry, so they read back unchanged
+    custom_controls = [
+        DialogControlEntry("msctls_progress32", "", 1003, 1, 2, 3, 4, style=WS_CHILD | WS_VISIBLE),
+        DialogControlEntry(0x0099, "", 1004, 1, 2, 3, 4, style=WS_CHILD | WS_VISIBLE | WS_TABSTOP, ex_style=WS_EX_CLIENTEDGE),
+        DialogControlEntry("MyCustomClass", "x", 1005, 1, 2, 3, 4, help_id=7),
+    ]
+    for is_ex in (False, True):
+        custom_props = DialogProperties(name=101, is_ex=is_ex)
+        _, reparsed = parse_dialog_rc_text(generate_dialog_rc_text(custom_props, custom_controls))
+        assert [(c.class_name, c.id_val, c.style, c.ex_style, c.help_id) for c in reparsed] == [
+            ("msctls_progress32", 1003, WS_CHILD | WS_VISIBLE, 0, 0),
+            ("0x99", 1004, WS_CHILD | WS_VISIBLE | WS_TABSTOP, WS_EX_CLIENTEDGE if is_ex else 0, 0),
+            ("MyCustomClass", 1005, 0, 0, 7 if is_ex else 0)], reparsed
+    # Every CONTROL line keeps its style operand, whatever the class and style
+    style_samples = (0, WS_CHILD | WS_VISIBLE, WS_CHILD | WS_VISIBLE | BS_GROUPBOX, SS_BLACKRECT, 0x21005F1F)
+    class_samples = (BUTTON_ATOM, STATIC_ATOM, EDIT_ATOM, LISTBOX_ATOM, 0x0099, "msctls_progress32", "Edit", WC_LISTVIEW)
+    sample_controls = [DialogControlEntry(class_name, "", 1, 1, 2, 3, 4, style=style, help_id=style & 1)
+                       for class_name in class_samples for style in style_samples]
+    for is_ex in (False, True):
+        rc_lines = generate_dialog_rc_text(DialogProperties(name=101, is_ex=is_ex), sample_controls).splitlines()
+        for rc_line in rc_lines:
+            if not rc_line.lstrip().startswith("CONTROL "): continue
+            statement = _DIALOG_STATEMENT_RE.match(rc_line)
+            assert statement is not None and statement.group("style"), rc_line
+    listbox_line = _emit_control_classic(DialogControlEntry(LISTBOX_ATOM, "", 1, 1, 2, 3, 4, style=WS_CHILD | LBS_STANDARD))
+    assert listbox_line.endswith(", LBS_STANDARD"), listbox_line
+    hidden_line = _emit_control_classic(DialogControlEntry(EDIT_ATOM, "", 1, 1, 2, 3, 4, style=WS_CHILD | WS_BORDER))
+    assert hidden_line.endswith(", WS_CHILD | WS_BORDER"), hidden_line
+
+    assert _eval_style("(WS_CHILD | WS_VISIBLE)") == WS_CHILD | WS_VISIBLE
+    assert _eval_style("WS_CHILD + 1") == WS_CHILD + 1
+    assert _eval_style("0x10L | 2l") == 0x12
+    assert _eval_style("WS_POPUP | (WS_CAPTION - WS_BORDER)") == WS_POPUP | WS_DLGFRAME
+    for bad_style in ("(WS_CHILD", "WS_CHILD |", "WS_CHILD )", "NO_SUCH_STYLE", "WS_CHILD # 1"):
+        try: _eval_style(bad_style)
+        except ValueError: pass
+        else: raise AssertionError(bad_style)
+
+    assert _read_word_or_string_align_mv(memoryview(b"A\x00B\x00\x00\x00\x00\x00"), 0) == ("AB", True, 8)
+    assert _read_word_or_string_align_mv(memoryview(b"\xff\xff\x80\x00"), 0) == (BUTTON_ATOM, False, 4)
+    assert _read_word_or_string_align_mv(memoryview(b"\x00\x00\x00\x00"), 0) == ("", True, 4)
+    assert _read_unicode_string_align_mv(memoryview(b"\x00\x01A\x00\x00\x00\x00\x00"), 0) == ("\u0100A", 8) # Odd-offset NUL pair
+    try: _read_unicode_string_align_mv(memoryview(b"A\x00B\x00"), 0)
+    except EOFError: pass
+    else: raise AssertionError("unterminated string")
     print("\ndialog_parser_util.py self-tests completed.")
+
+
+if __name__ == '__main__':
+    if not sys.flags.optimize: # The checks are asserts; skip them under -O
+        _self_test()
@@ -114,8 +114,10 @@ class DialogResource(Resource):
 
     @classmethod
     def parse_from_binary_data(cls, raw_data: bytes, identifier: ResourceIdentifier) -> 'DialogResource':
-        from ..core.dialog_parser_util import _read_unicode_string_align, _read_word_or_string_align, ATOM_TO_CLASSNAME_MAP, DS_SETFONT, DS_SHELLFONT
+        from ..core.dialog_parser_util import (_read_unicode_string_align_mv, _read_word_or_string_align_mv, ATOM_TO_CLASSNAME_MAP, DS_SETFONT, DS_SHELLFONT,
+                                               DLGTEMPLATE_HDR, DLGTEMPLATEEX_HDR, DLGITEMTEMPLATE_HDR, DLGITEMTEMPLATEEX_HDR)
         stream = io.BytesIO(raw_data)
+        raw_view = memoryview(raw_data) # Taken once; ordinal/string fields are decoded in place from here, then the stream skips them
         props = DialogProperties(name=identifier.name_id, symbolic_name=(str(identifier.name_id) if isinstance(identifier.name_id, str) else None), is_ex=False)
         controls_list: List[DialogControlEntry] = []
         c_dlg_items = 0
@@ -130,39 +132,37 @@ class DialogResource(Resource):
 
             if word1 == 1 and word2 == 0xFFFF: # DIALOGEX
                 props.is_ex = True
-                hdr_fmt = '<HHLLLHHHHH'
-                hdr_size = struct.calcsize(hdr_fmt)
+                hdr_size = DLGTEMPLATEEX_HDR.size
                 current_field = "DIALOGEX Header"
                 header_data = stream.read(hdr_size)
                 if len(header_data) < hdr_size: raise EOFError(f"Incomplete data for {current_field} (expected {hdr_size}, got {len(header_data)}).")
-                header_tuple_ex = struct.unpack(hdr_fmt, header_data)
+                header_tuple_ex = DLGTEMPLATEEX_HDR.unpack(header_data)
                 props.help_id = header_tuple_ex[2]; props.ex_style = header_tuple_ex[3]; props.style = header_tuple_ex[4]; c_dlg_items = header_tuple_ex[5]; props.x, props.y, props.width, props.height = header_tuple_ex[6:10]
             else: # DLGTEMPLATE
                 props.is_ex = False
-                hdr_fmt = '<LLHHHHH'
-                hdr_size = struct.calcsize(hdr_fmt)
+                hdr_size = DLGTEMPLATE_HDR.size
                 current_field = "DLGTEMPLATE Header"
                 header_data_std = stream.read(hdr_size)
                 if len(header_data_std) < hdr_size: raise EOFError(f"Incomplete data for {current_field} (expected {hdr_size}, got {len(header_data_std)}).")
-                header_tuple_std = struct.unpack(hdr_fmt, header_data_std)
+                header_tuple_std = DLGTEMPLATE_HDR.unpack(header_data_std)
                 props.style = header_tuple_std[0]; props.ex_style = header_tuple_std[1]; c_dlg_items = header_tuple_std[2]; props.x, props.y, props.width, props.height = header_tuple_std[3:7]
 
             current_field = "Menu Name"
-            menu_val, menu_is_str = _read_word_or_string_align(stream)
+            menu_val, menu_is_str, field_end = _read_word_or_string_align_mv(raw_view, stream.tell()); stream.seek(field_end)
             if menu_val is None:
                 raise EOFError(f"Failed to read {current_field} at offset {stream.tell()} due to EOF or incomplete data from helper.")
             props.menu_name = menu_val if menu_val not in ["", 0] else None
             if menu_is_str and isinstance(menu_val, str) and menu_val != "": props.symbolic_menu_name = menu_val
 
             current_field = "Class Name"
-            class_val, class_is_str = _read_word_or_string_align(stream)
+            class_val, class_is_str, field_end = _read_word_or_string_align_mv(raw_view, stream.tell()); stream.seek(field_end)
             if class_val is None:
                 raise EOFError(f"Failed to read {current_field} at offset {stream.tell()} due to EOF or incomplete data from helper.")
             props.class_name = class_val if class_val not in ["", 0] else None
             if class_is_str and isinstance(class_val, str) and class_val != "": props.symbolic_class_name = class_val
 
             current_field = "Caption"
-            caption_val = _read_unicode_string_align(stream)
+            caption_val, field_end = _read_unicode_string_align_mv(raw_view, stream.tell()); stream.seek(field_end)
             if caption_val is None: # Caption is mandatory, even if empty. None here means stream ended prematurely.
                 raise EOFError(f"Failed to read {current_field} at offset {stream.tell()} due to EOF or incomplete data from helper.")
             props.caption = caption_val
@@ -177,10 +177,10 @@ class DialogResource(Resource):
                     current_field = "DIALOGEX Font extra data (Weight, Italic, Charset)"
                     font_extra_bytes = stream.read(4)
                     if len(font_extra_bytes) < 4 : raise EOFError(f"Incomplete {current_field} (expected 4, got {len(font_extra_bytes)}).")
-                    props.font_weight, props.font_italic_byte, props.font_charset = struct.unpack('<HBB', font_extra_bytes); props.font_italic = bool(props.font_italic_byte)
+                    props.font_weight, font_italic_byte, props.font_charset = struct.unpack('<HBB', font_extra_bytes); props.font_italic = bool(font_italic_byte)
 
                 current_field = "Font Name"
-                font_name_val = _read_unicode_string_align(stream)
+                font_name_val, field_end = _read_unicode_string_align_mv(raw_view, stream.tell()); stream.seek(field_end)
                 if font_name_val is None: # If DS_SETFONT is set, font name is expected.
                     raise EOFError(f"Failed to read {current_field} at offset {stream.tell()} due to EOF or incomplete data from helper.")
                 props.font_name = font_name_val
@@ -190,11 +190,7 @@ class DialogResource(Resource):
                 align_pos = (stream.tell() + 3) & ~3
                 if align_pos > len(raw_data):
                     raise EOFError(f"Alignment seek for control #{i+1} would go past EOF (current: {stream.tell()}, align_to: {align_pos}, total: {len(raw_data)}).")
-                if stream.tell() < align_pos:
-                    padding_bytes_to_read = align_pos - stream.tell()
-                    padding_read = stream.read(padding_bytes_to_read)
-                    if len(padding_read) < padding_bytes_to_read:
-                        raise EOFError(f"EOF while reading alignment padding for control #{i+1} (expected {padding_bytes_to_read}, got {len(padding_read)}).")
+                stream.seek(align_pos) # Bounds checked above; the padding bytes themselves are never needed
 
                 if stream.tell() >= len(raw_data):
                     print(f"Warning: Expected {c_dlg_items} controls, but found EOF at offset {stream.tell()} before reading header of control #{i+1}")
@@ -205,27 +201,29 @@ class DialogResource(Resource):
 
                 if item_is_ex:
                     current_field = f"DLGITEMTEMPLATEEX header for ctrl #{i+1}"
-                    item_hdr_fmt = '<LLLhhhhL'; item_hdr_size = struct.calcsize(item_hdr_fmt)
+                    item_hdr_size = DLGITEMTEMPLATEEX_HDR.size
                     item_header_data = stream.read(item_hdr_size)
                     if len(item_header_data) < item_hdr_size: raise EOFError(f"Incomplete data for {current_field} (expected {item_hdr_size}, got {len(item_header_data)}).")
-                    help_id_ctrl, ex_style_ctrl, style_ctrl, x_ctrl, y_ctrl, w_ctrl, h_ctrl, id_ctrl = struct.unpack(item_hdr_fmt, item_header_data)
+                    help_id_ctrl, ex_style_ctrl, style_ctrl, x_ctrl, y_ctrl, w_ctrl, h_ctrl, id_ctrl = DLGITEMTEMPLATEEX_HDR.unpack(item_header_data)
                 else:
                     current_field = f"DLGITEMTEMPLATE header for ctrl #{i+1}"
-                    item_hdr_fmt = '<LLhhhhH'; item_hdr_size = struct.calcsize(item_hdr_fmt)
+                    item_hdr_size = DLGITEMTEMPLATE_HDR.size
                     item_header_data = stream.read(item_hdr_size)
                     if len(item_header_data) < item_hdr_size: raise EOFError(f"Incomplete data for {current_field} (expected {item_hdr_size}, got {len(item_header_data)}).")
-                    style_ctrl, ex_style_ctrl, x_ctrl, y_ctrl, w_ctrl, h_ctrl, id_ctrl_word = struct.unpack(item_hdr_fmt, item_header_data); id_ctrl = id_ctrl_word
+                    style_ctrl, ex_style_ctrl, x_ctrl, y_ctrl, w_ctrl, h_ctrl, id_ctrl_word = DLGITEMTEMPLATE_HDR.unpack(item_header_data); id_ctrl = id_ctrl_word
 
                 current_field = f"Control #{i+1} Class String/Ordinal"
-                class_val_ctrl, _ = _read_word_or_string_align(stream)
+                class_val_ctrl, _, field_end = _read_word_or_string_align_mv(raw_view, stream.tell()); stream.seek(field_end)
                 if class_val_ctrl is None: raise EOFError(f"EOF while reading {current_field}.")
 
                 current_field = f"Control #{i+1} Text String/Ordinal"
-                text_val_ctrl, _ = _read_word_or_string_align(stream)
+                text_val_ctrl, _, field_end = _read_word_or_string_align_mv(raw_view, stream.tell()); stream.seek(field_end)
                 if text_val_ctrl is None: raise EOFError(f"EOF while reading {current_field}.")
 
-                class_name_str_ctrl = str(class_val_ctrl)
-                if isinstance(class_val_ctrl, int): class_name_str_ctrl = ATOM_TO_CLASSNAME_MAP.get(class_val_ctrl, f"0x{class_val_ctrl:04X}")
+                if isinstance(class_val_ctrl, int): # The hex name is only formatted for atoms missing from the map
+                    class_name_str_ctrl = ATOM_TO_CLASSNAME_MAP.get(class_val_ctrl)
+                    if class_name_str_ctrl is None: class_name_str_ctrl = f"0x{class_val_ctrl:04X}"
+                else: class_name_str_ctrl = class_val_ctrl
                 text_str_ctrl = str(text_val_ctrl) if isinstance(text_val_ctrl, str) else ""
 
                 control_creation_data: Optional[bytes] = b''
@@ -305,18 +303,19 @@ class DialogResource(Resource):
 
 
     def to_binary_data(self) -> bytes:
-        from ..core.dialog_parser_util import DS_SETFONT, DS_SHELLFONT, BUTTON_ATOM, EDIT_ATOM, STATIC_ATOM, LISTBOX_ATOM, SCROLLBAR_ATOM, COMBOBOX_ATOM, CLASSNAME_TO_ATOM_MAP
+        from ..core.dialog_parser_util import (DS_SETFONT, DS_SHELLFONT, BUTTON_ATOM, EDIT_ATOM, STATIC_ATOM, LISTBOX_ATOM, SCROLLBAR_ATOM, COMBOBOX_ATOM, CLASSNAME_TO_ATOM_MAP,
+                                               DLGTEMPLATE_HDR, DLGTEMPLATEEX_HDR, DLGITEMTEMPLATE_HDR, DLGITEMTEMPLATEEX_HDR)
         stream = io.BytesIO()
         props = self.properties
 
         if props.is_ex:
-            header_part1 = struct.pack('<HHLLLHHHHH',
+            header_part1 = DLGTEMPLATEEX_HDR.pack(
                                      1, 0xFFFF,
                                      props.help_id, props.ex_style, props.style,
                                      len(self.controls), props.x, props.y, props.width, props.height)
             stream.write(header_part1)
         else:
-            header_part1 = struct.pack('<LLHHHHH',
+            header_part1 = DLGTEMPLATE_HDR.pack(
                                      props.style, props.ex_style,
                                      len(self.controls), props.x, props.y, props.width, props.height)
             stream.write(header_part1)
@@ -346,16 +345,16 @@ class DialogResource(Resource):
             if padding > 0: stream.write(b'\x00' * padding)
 
             if props.is_ex:
-                item_header = struct.pack('<LLLhhhhL',
+                item_header = DLGITEMTEMPLATEEX_HDR.pack(
                                           ctrl.help_id, ctrl.ex_style, ctrl.style,
                                           ctrl.x, ctrl.y, ctrl.width, ctrl.height,
-                                          ctrl.id_val if isinstance(ctrl.id_val, int) else 0)
+                                          ctrl.id_val & 0xFFFFFFFF if isinstance(ctrl.id_val, int) else 0)
                 stream.write(item_header)
             else:
-                item_header = struct.pack('<LLhhhhH',
+                item_header = DLGITEMTEMPLATE_HDR.pack(
                                           ctrl.style, ctrl.ex_style,
                                           ctrl.x, ctrl.y, ctrl.width, ctrl.height,
-                                          ctrl.id_val if isinstance(ctrl.id_val, int) else 0)
+                                          ctrl.id_val & 0xFFFF if isinstance(ctrl.id_val, int) else 0) # IDC_STATIC (-1) is 0xFFFF
                 stream.write(item_header)
 
             class_to_write: Union[str, int, None] = None